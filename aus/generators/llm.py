@@ -3,58 +3,457 @@
 Both providers are called through the same LLMRequest/LLMResponse interface.
 The pipeline orchestrator uses these via the llm_call function passed to Pipeline.
 
-Provides two calling modes:
+Provides three calling modes:
   - call_gemini / call_claude — batch (returns LLMResponse when done)
-  - stream_gemini / stream_claude — yields token dicts as they arrive
+  - stream_gemini / stream_claude — yields (kind, payload) tuples as tokens arrive
+  - call_gemini_batch / call_claude_batch — provider Batch APIs for bulk,
+    latency-tolerant work (discounted, results arrive asynchronously)
 """
 
 from __future__ import annotations
 
 import time
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import importlib.util
 import logging
-from typing import Any, AsyncIterator
+import random
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, NamedTuple
+
+import httpx
+
+# Provider SDKs are optional — resolve them once here rather than per call
+try:
+    from google import genai
+    from google.genai import errors as genai_errors
+    from google.genai import types as genai_types
+except ImportError:
+    genai = None
+    genai_errors = None
+    genai_types = None
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
 
 from aus.models import LLMRequest, LLMResponse
+from aus.generators.llm_cache import response_cache, SemanticCache
 
 log = logging.getLogger("aus.llm")
 
+# Stream chunk kinds. Streams yield (TOKEN, text) per token and a final
+# (DONE, stats_dict) — tuples keep the per-token hot path allocation-light.
+TOKEN = "token"
+DONE = "done"
+
+# Shared SDK clients, keyed by API key. Each client owns an httpx connection
+# pool, so reusing it keeps TCP+TLS sessions alive across LLM calls.
+_gemini_clients: dict[str, Any] = {}
+_anthropic_clients: dict[str, Any] = {}
+
+# Pool settings for both providers' httpx clients. HTTP/2 multiplexes
+# concurrent calls over one connection; httpx needs the optional h2 package.
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+def _get_gemini(api_key: str):
+    """Return the shared genai.Client for this key, creating it on first use."""
+    client = _gemini_clients.get(api_key)
+    if client is None:
+        if genai is None:
+            raise RuntimeError("google-genai is not installed (pip install google-genai)")
+        client = genai.Client(
+            api_key=api_key,
+            http_options=genai_types.HttpOptions(
+                async_client_args={"limits": HTTP_LIMITS, "http2": HTTP2},
+            ),
+        )
+        _gemini_clients[api_key] = client
+    return client
 
-async def call_gemini(request: LLMRequest, api_key: str) -> LLMResponse:
-    """Call Google Gemini via the google-genai SDK (truly async).
 
-    Uses client.aio for non-blocking HTTP calls.
-    Handles RECITATION blocks by returning empty content with a warning
-    so the caller can retry with a different model.
+def gemini_client(api_key: str):
+    """Shared genai.Client for this key, for callers outside this module."""
+    return _get_gemini(api_key)
+
+
+def claude_client(api_key: str):
+    """Shared AsyncAnthropic client for this key, for callers outside this module.
+
+    It is built with max_retries=0; use .with_options(max_retries=...) for
+    SDK-level retries on the same connection pool.
     """
-    from google import genai
+    return _get_claude(api_key)
+
+
+def _get_claude(api_key: str):
+    """Return the shared AsyncAnthropic client for this key, creating it on first use."""
+    client = _anthropic_clients.get(api_key)
+    if client is None:
+        if anthropic is None:
+            raise RuntimeError("anthropic is not installed (pip install anthropic)")
+        client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            max_retries=0,  # retries are handled by _with_retry
+            http_client=httpx.AsyncClient(limits=HTTP_LIMITS, http2=HTTP2),
+        )
+        _anthropic_clients[api_key] = client
+    return client
+
+
+# Provider-side prompt caching. Claude caches any system block marked with
+# cache_control; Gemini needs an explicit cached_content handle, which we only
+# create once the same system instruction has recurred a few times.
+CLAUDE_CACHE_MIN_CHARS = 1024
+GEMINI_CACHE_MIN_USES = 3
+GEMINI_CACHE_TTL_SECONDS = 3600
+# A handle is recreated this long before its TTL runs out, so calls never
+# send a cache name that expires on the way
+GEMINI_CACHE_RENEW_MARGIN = 300
+# Distinct system instructions tracked (use counts and cache handles)
+GEMINI_CACHE_MAX_PREFIXES = 256
+
+_gemini_prefix_uses: OrderedDict[str, int] = OrderedDict()
+# digest -> (cached_content name or None if creation failed, renew-by monotonic time)
+_gemini_cached_contents: OrderedDict[str, tuple[str | None, float]] = OrderedDict()
+
+
+def _claude_system(system_content: str) -> str | list[dict[str, Any]]:
+    """Build Claude's system param, marking long prompts as cacheable."""
+    system = system_content.strip()
+    if len(system) <= CLAUDE_CACHE_MIN_CHARS:
+        return system
+    return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+
+async def _gemini_cached_content(
+    client: Any, api_key: str, model: str, system_instruction: str | None
+) -> str | None:
+    """Return a Gemini cached_content name for a recurring system instruction.
+
+    Returns None until the instruction has been seen GEMINI_CACHE_MIN_USES
+    times, or if cache creation failed (e.g. prompt below the provider's
+    minimum cacheable size) — callers then send the instruction inline.
+    """
+    if not system_instruction:
+        return None
+    digest = hashlib.sha256(
+        f"{api_key}\0{model}\0{system_instruction}".encode()
+    ).hexdigest()
+    entry = _gemini_cached_contents.get(digest)
+    if entry is not None:
+        if entry[1] > time.monotonic():
+            return entry[0]
+        # Close to expiry (or a failed create due for another try): recreate
+        del _gemini_cached_contents[digest]
+    else:
+        uses = _gemini_prefix_uses.pop(digest, 0) + 1
+        if uses < GEMINI_CACHE_MIN_USES:
+            _gemini_prefix_uses[digest] = uses
+            while len(_gemini_prefix_uses) > GEMINI_CACHE_MAX_PREFIXES:
+                _gemini_prefix_uses.popitem(last=False)
+            return None
 
-    client = genai.Client(api_key=api_key)
+    try:
+        cache = await client.aio.caches.create(
+            model=model,
+            config=genai_types.CreateCachedContentConfig(
+                system_instruction=system_instruction,
+                ttl=f"{GEMINI_CACHE_TTL_SECONDS}s",
+            ),
+        )
+        name = cache.name
+        log.info(f"Created Gemini context cache {name} for {model}")
+    except Exception as e:
+        log.debug(f"Gemini context cache unavailable for {model}: {e}")
+        name = None
+    renew_at = time.monotonic() + GEMINI_CACHE_TTL_SECONDS - GEMINI_CACHE_RENEW_MARGIN
+    _gemini_cached_contents[digest] = (name, renew_at)
+    while len(_gemini_cached_contents) > GEMINI_CACHE_MAX_PREFIXES:
+        _gemini_cached_contents.popitem(last=False)
+    return name
+
+
+def _is_missing_gemini_cache(exc: Exception) -> bool:
+    """True if Gemini rejected a call because its cached_content is gone."""
+    return (
+        genai_errors is not None
+        and isinstance(exc, genai_errors.APIError)
+        and exc.code in (400, 403, 404)
+        and "cache" in str(exc).lower()
+    )
 
-    # Build contents from messages
-    system_instruction = None
-    contents = []
 
+def _forget_gemini_cache(name: str) -> None:
+    for digest, (cached_name, _) in list(_gemini_cached_contents.items()):
+        if cached_name == name:
+            del _gemini_cached_contents[digest]
+
+
+# ---------------------------------------------------------------------------
+# Message conversion — LLMMessage → provider wire format
+# ---------------------------------------------------------------------------
+
+
+def _to_gemini_content(role: str, text: str) -> dict[str, Any]:
+    return {"role": "user" if role == "user" else "model", "parts": [{"text": text}]}
+
+
+def _to_claude_message(role: str, text: str) -> dict[str, Any]:
+    return {"role": role, "content": text}
+
+
+def _gemini_payload(request: LLMRequest) -> tuple[str | None, list[dict[str, Any]]]:
+    """Split a request into (system_instruction, contents) for Gemini."""
+    system_instruction = None
+    contents: list[dict[str, Any]] = []
+    append = contents.append
     for msg in request.messages:
         if msg.role == "system":
             system_instruction = msg.content
         else:
-            role = "user" if msg.role == "user" else "model"
-            contents.append({"role": role, "parts": [{"text": msg.content}]})
+            append(_to_gemini_content(msg.role, msg.content))
+    return system_instruction, contents
+
+
+def _claude_payload(request: LLMRequest) -> tuple[str, list[dict[str, Any]]]:
+    """Split a request into (system_content, messages) for Claude."""
+    system_parts: list[str] = []
+    messages: list[dict[str, Any]] = []
+    append = messages.append
+    for msg in request.messages:
+        if msg.role == "system":
+            system_parts.append(msg.content)
+        else:
+            append(_to_claude_message(msg.role, msg.content))
+    system_content = "\n".join(system_parts) + "\n" if system_parts else ""
+    return system_content, messages
+
+
+async def aclose_clients() -> None:
+    """Close all shared SDK clients (call on server/app shutdown)."""
+    for client in _anthropic_clients.values():
+        await client.close()
+    for client in _gemini_clients.values():
+        aclose = getattr(client.aio, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    _anthropic_clients.clear()
+    _gemini_clients.clear()
+    response_cache.log_stats()
+
 
+# Approximate input context windows by model family, used to reject
+# oversize prompts locally. Estimated at ~4 chars/token.
+CONTEXT_WINDOWS = {"gemini": 1_048_576, "claude": 200_000}
+
+
+class PromptTooLargeError(ValueError):
+    """The prompt is estimated to exceed the model's context window."""
+
+
+def _precheck(request: LLMRequest, model: str) -> LLMResponse | None:
+    """Settle requests that can't succeed without a network round-trip.
+
+    Returns an empty response when there is nothing to answer (no
+    non-blank conversation, or no output budget); raises
+    PromptTooLargeError when the prompt can't fit the model's window.
+    """
+    if request.max_tokens <= 0 or not any(
+        m.role != "system" and m.content.strip() for m in request.messages
+    ):
+        log.warning(f"Skipping {model} call: empty conversation or max_tokens <= 0")
+        return LLMResponse(content="", model=model, tokens_in=0, tokens_out=0, duration_ms=0)
+
+    window = CONTEXT_WINDOWS.get(model.split("-", 1)[0])
+    estimate = sum(len(m.content) for m in request.messages) // 4
+    if window and estimate > window:
+        raise PromptTooLargeError(
+            f"Prompt for {model} is ~{estimate} tokens, over the {window}-token context window"
+        )
+    return None
+
+
+# Transient-failure retries: rate limits, overload, 5xx and dropped connections.
+# Backoff is exponential with jitter unless the provider sends Retry-After.
+RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504, 529})
+
+
+class RetryPolicy(NamedTuple):
+    attempts: int
+    base_delay: float
+    max_delay: float
+
+
+DEFAULT_RETRY = RetryPolicy(RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+# For callers that have another model to fall back to: one quick retry, then
+# let them move on instead of spending ~15s backing off on the same model
+FALLBACK_RETRY = RetryPolicy(2, 0.25, 0.5)
+
+_retry_policy: contextvars.ContextVar[RetryPolicy] = contextvars.ContextVar(
+    "retry_policy", default=DEFAULT_RETRY
+)
+
+
+@contextlib.contextmanager
+def retry_budget(policy: RetryPolicy) -> Iterator[None]:
+    """Use `policy` for LLM calls made in this context (same task)."""
+    token = _retry_policy.set(policy)
+    try:
+        yield
+    finally:
+        _retry_policy.reset(token)
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """True for provider errors worth retrying: rate limits, overload, 5xx, network."""
+    if anthropic is not None:
+        if isinstance(exc, anthropic.APIConnectionError):
+            return True
+        if isinstance(exc, anthropic.APIStatusError):
+            return exc.status_code in RETRY_STATUSES
+    if genai_errors is not None and isinstance(exc, genai_errors.APIError):
+        return exc.code in RETRY_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+
+def _retry_after(exc: Exception) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    value = headers.get("retry-after") if headers else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+async def _with_retry(call: Callable[[], Awaitable[LLMResponse]], label: str) -> LLMResponse:
+    """Await call(), retrying transient provider errors with backoff.
+
+    Attempts and delays come from the current retry_budget (DEFAULT_RETRY).
+    """
+    attempts, base_delay, max_delay = _retry_policy.get()
+    for attempt in range(1, attempts + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == attempts or not is_transient_error(e):
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = base_delay * (2 ** (attempt - 1) + random.random() * 0.5)
+            delay = min(delay, max_delay)
+            log.warning(
+                f"{label} transient error ({type(e).__name__}), "
+                f"retry {attempt}/{attempts - 1} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+# In-flight deterministic calls, keyed like the response cache. Concurrent
+# identical requests share one generation task; it runs in its own task so a
+# caller being cancelled doesn't cancel it for the others.
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def _generate_and_store(
+    key: str, generate: Callable[[], Awaitable[LLMResponse]]
+) -> LLMResponse:
+    result = await generate()
+    if result.content:
+        await response_cache.set(key, result)
+    return result
+
+
+def _inflight_done(key: str, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # mark retrieved even if every caller went away
+
+
+async def _cached_call(
+    request: LLMRequest, model: str, generate: Callable[[], Awaitable[LLMResponse]]
+) -> LLMResponse:
+    """Serve from the exact cache, coalesce identical in-flight calls, then store."""
+    key = response_cache.key_for(request, model)
+    if key is None:
+        return await generate()
+
+    cached = await response_cache.get(key)
+    if cached:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_generate_and_store(key, generate))
+        task.add_done_callback(lambda t: _inflight_done(key, t))
+        _inflight[key] = task
+    return await asyncio.shield(task)
+
+
+async def call_gemini(request: LLMRequest, api_key: str) -> LLMResponse:
+    """Call Google Gemini via the google-genai SDK (truly async).
+
+    Uses client.aio for non-blocking HTTP calls.
+    Handles RECITATION blocks by returning empty content with a warning
+    so the caller can retry with a different model.
+    """
     model = request.model or "gemini-3-flash-preview"
-    start = time.time()
+    trivial = _precheck(request, model)
+    if trivial is not None:
+        return trivial
+    return await _cached_call(request, model, lambda: _with_retry(
+        lambda: _gemini_generate(request, api_key, model), f"Gemini {model}"
+    ))
 
-    response = await client.aio.models.generate_content(
-        model=model,
-        contents=contents,
-        config={
-            "system_instruction": system_instruction,
-            "temperature": request.temperature,
-            "max_output_tokens": request.max_tokens,
-        },
-    )
 
-    duration = int((time.time() - start) * 1000)
+async def _gemini_generate(request: LLMRequest, api_key: str, model: str) -> LLMResponse:
+    client = _get_gemini(api_key)
+
+    system_instruction, contents = _gemini_payload(request)
+
+    start = time.monotonic_ns()
+
+    config: dict[str, Any] = {
+        "temperature": request.temperature,
+        "max_output_tokens": request.max_tokens,
+    }
+    cached_content = await _gemini_cached_content(client, api_key, model, system_instruction)
+    if cached_content:
+        config["cached_content"] = cached_content
+    else:
+        config["system_instruction"] = system_instruction
+
+    try:
+        response = await client.aio.models.generate_content(
+            model=model,
+            contents=contents,
+            config=config,
+        )
+    except Exception as e:
+        if not cached_content or not _is_missing_gemini_cache(e):
+            raise
+        # Deleted or expired server-side: drop the handle and send inline
+        log.warning(f"Gemini context cache {cached_content} is gone, resending inline")
+        _forget_gemini_cache(cached_content)
+        del config["cached_content"]
+        config["system_instruction"] = system_instruction
+        response = await client.aio.models.generate_content(
+            model=model,
+            contents=contents,
+            config=config,
+        )
+
+    duration = (time.monotonic_ns() - start) // 1_000_000
 
     # Check for RECITATION block
     if response.candidates and hasattr(response.candidates[0], "finish_reason"):
@@ -88,60 +487,58 @@ async def call_claude(request: LLMRequest, api_key: str) -> LLMResponse:
     Uses AsyncAnthropic for non-blocking HTTP calls.
     Uses async streaming for large max_tokens to avoid SDK timeout errors.
     """
-    import anthropic
+    model = request.model or "claude-sonnet-4-6"
+    trivial = _precheck(request, model)
+    if trivial is not None:
+        return trivial
+    return await _cached_call(request, model, lambda: _with_retry(
+        lambda: _claude_generate(request, api_key, model), f"Claude {model}"
+    ))
 
-    client = anthropic.AsyncAnthropic(api_key=api_key)
 
-    # Separate system from conversation messages
-    system_content = ""
-    messages = []
+async def _claude_generate(request: LLMRequest, api_key: str, model: str) -> LLMResponse:
+    client = _get_claude(api_key)
 
-    for msg in request.messages:
-        if msg.role == "system":
-            system_content += msg.content + "\n"
-        else:
-            messages.append({"role": msg.role, "content": msg.content})
+    # Separate system from conversation messages
+    system_content, messages = _claude_payload(request)
 
-    model = request.model or "claude-sonnet-4-6"
-    start = time.time()
+    start = time.monotonic_ns()
 
     # Use streaming for large outputs to avoid SDK 10-minute timeout
     if request.max_tokens > 8000:
-        content = ""
+        parts: list[str] = []
         tokens_in = 0
         tokens_out = 0
 
         async with client.messages.stream(
             model=model,
             max_tokens=request.max_tokens,
-            system=system_content.strip() if system_content else "",
+            system=_claude_system(system_content),
             messages=messages,
             temperature=request.temperature,
         ) as stream:
             async for text in stream.text_stream:
-                content += text
+                parts.append(text)
 
             # Get final message for usage stats
             final = await stream.get_final_message()
             tokens_in = final.usage.input_tokens
             tokens_out = final.usage.output_tokens
+        content = "".join(parts)
     else:
         response = await client.messages.create(
             model=model,
             max_tokens=request.max_tokens,
-            system=system_content.strip() if system_content else "",
+            system=_claude_system(system_content),
             messages=messages,
             temperature=request.temperature,
         )
 
-        content = ""
-        for block in response.content:
-            if hasattr(block, "text"):
-                content += block.text
+        content = "".join(b.text for b in response.content if hasattr(b, "text"))
         tokens_in = response.usage.input_tokens
         tokens_out = response.usage.output_tokens
 
-    duration = int((time.time() - start) * 1000)
+    duration = (time.monotonic_ns() - start) // 1_000_000
 
     return LLMResponse(
         content=content,
@@ -159,42 +556,46 @@ async def call_claude(request: LLMRequest, api_key: str) -> LLMResponse:
 
 async def stream_gemini(
     request: LLMRequest, api_key: str
-) -> AsyncIterator[dict]:
+) -> AsyncIterator[tuple[str, Any]]:
     """Stream Gemini tokens as they arrive.
 
-    Yields dicts: {"type": "token", "content": str}
-    Final yield: {"type": "done", "model": str, "tokens_in": int, "tokens_out": int, "duration_ms": int}
+    Yields (TOKEN, text) tuples.
+    Final yield: (DONE, {"model": str, "tokens_in": int, "tokens_out": int,
+    "duration_ms": int, "recitation": bool})
     """
-    from google import genai
-    from google.genai import types as genai_types
+    client = _get_gemini(api_key)
 
-    client = genai.Client(api_key=api_key)
-
-    system_instruction = None
-    contents = []
-    for msg in request.messages:
-        if msg.role == "system":
-            system_instruction = msg.content
-        else:
-            role = "user" if msg.role == "user" else "model"
-            contents.append({"role": role, "parts": [{"text": msg.content}]})
+    system_instruction, contents = _gemini_payload(request)
 
     model = request.model or "gemini-3-flash-preview"
-    start = time.time()
+    start = time.monotonic_ns()
 
+    cached_content = await _gemini_cached_content(client, api_key, model, system_instruction)
     config = genai_types.GenerateContentConfig(
-        system_instruction=system_instruction,
+        system_instruction=None if cached_content else system_instruction,
+        cached_content=cached_content,
         temperature=request.temperature,
         max_output_tokens=request.max_tokens,
     )
 
-    tokens_in = 0
-    tokens_out = 0
+    usage = None
     recitation = False
 
-    stream = await client.aio.models.generate_content_stream(
-        model=model, contents=contents, config=config,
-    )
+    try:
+        stream = await client.aio.models.generate_content_stream(
+            model=model, contents=contents, config=config,
+        )
+    except Exception as e:
+        if not cached_content or not _is_missing_gemini_cache(e):
+            raise
+        log.warning(f"Gemini context cache {cached_content} is gone, resending inline")
+        _forget_gemini_cache(cached_content)
+        config = config.model_copy(
+            update={"cached_content": None, "system_instruction": system_instruction}
+        )
+        stream = await client.aio.models.generate_content_stream(
+            model=model, contents=contents, config=config,
+        )
     async for chunk in stream:
         # Check for RECITATION
         if chunk.candidates:
@@ -205,20 +606,19 @@ async def stream_gemini(
 
         text = chunk.text
         if text:
-            yield {"type": "token", "content": text}
+            yield TOKEN, text
 
-        # Accumulate usage from each chunk
-        if chunk.usage_metadata:
-            tokens_in = getattr(chunk.usage_metadata, "prompt_token_count", 0) or 0
-            tokens_out = getattr(chunk.usage_metadata, "candidates_token_count", 0) or 0
+        # Usage is cumulative; only the latest report matters, read it once below
+        usage = chunk.usage_metadata or usage
 
-    duration = int((time.time() - start) * 1000)
+    tokens_in = getattr(usage, "prompt_token_count", 0) or 0
+    tokens_out = getattr(usage, "candidates_token_count", 0) or 0
+    duration = (time.monotonic_ns() - start) // 1_000_000
 
     if recitation:
         log.warning(f"Gemini {model} hit RECITATION during streaming")
 
-    yield {
-        "type": "done",
+    yield DONE, {
         "model": model,
         "tokens_in": tokens_in,
         "tokens_out": tokens_out,
@@ -229,44 +629,36 @@ async def stream_gemini(
 
 async def stream_claude(
     request: LLMRequest, api_key: str
-) -> AsyncIterator[dict]:
+) -> AsyncIterator[tuple[str, Any]]:
     """Stream Claude tokens as they arrive.
 
-    Yields dicts: {"type": "token", "content": str}
-    Final yield: {"type": "done", "model": str, "tokens_in": int, "tokens_out": int, "duration_ms": int}
+    Yields (TOKEN, text) tuples.
+    Final yield: (DONE, {"model": str, "tokens_in": int, "tokens_out": int,
+    "duration_ms": int, "recitation": bool})
     """
-    import anthropic
+    client = _get_claude(api_key)
 
-    client = anthropic.AsyncAnthropic(api_key=api_key)
-
-    system_content = ""
-    messages = []
-    for msg in request.messages:
-        if msg.role == "system":
-            system_content += msg.content + "\n"
-        else:
-            messages.append({"role": msg.role, "content": msg.content})
+    system_content, messages = _claude_payload(request)
 
     model = request.model or "claude-sonnet-4-6"
-    start = time.time()
+    start = time.monotonic_ns()
 
     async with client.messages.stream(
         model=model,
         max_tokens=request.max_tokens,
-        system=system_content.strip() if system_content else "",
+        system=_claude_system(system_content),
         messages=messages,
         temperature=request.temperature,
     ) as stream:
         async for text in stream.text_stream:
-            yield {"type": "token", "content": text}
+            yield TOKEN, text
 
         final = await stream.get_final_message()
         tokens_in = final.usage.input_tokens
         tokens_out = final.usage.output_tokens
 
-    duration = int((time.time() - start) * 1000)
-    yield {
-        "type": "done",
+    duration = (time.monotonic_ns() - start) // 1_000_000
+    yield DONE, {
         "model": model,
         "tokens_in": tokens_in,
         "tokens_out": tokens_out,
@@ -275,44 +667,238 @@ async def stream_claude(
     }
 
 
+# ---------------------------------------------------------------------------
+# Batch APIs — bulk requests processed asynchronously by the provider
+# ---------------------------------------------------------------------------
+
+BATCH_POLL_INTERVAL = 10.0
+
+_GEMINI_BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED",
+}
+
+
+async def call_claude_batch(
+    requests: list[LLMRequest], api_key: str
+) -> list[LLMResponse]:
+    """Run requests through the Anthropic Message Batches API.
+
+    Polls until the batch has ended. Failed or expired entries come back
+    as empty-content responses, matching how call_claude reports blocks.
+    """
+    client = _get_claude(api_key)
+    models = [r.model or "claude-sonnet-4-6" for r in requests]
+    start = time.monotonic_ns()
+
+    params = []
+    for i, (request, model) in enumerate(zip(requests, models)):
+        system_content, messages = _claude_payload(request)
+        params.append({
+            "custom_id": str(i),
+            "params": {
+                "model": model,
+                "max_tokens": request.max_tokens,
+                "system": _claude_system(system_content),
+                "messages": messages,
+                "temperature": request.temperature,
+            },
+        })
+
+    batch = await client.messages.batches.create(requests=params)
+    while batch.processing_status != "ended":
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        batch = await client.messages.batches.retrieve(batch.id)
+
+    duration = (time.monotonic_ns() - start) // 1_000_000
+    responses = [
+        LLMResponse(content="", model=model, tokens_in=0, tokens_out=0, duration_ms=duration)
+        for model in models
+    ]
+    async for entry in await client.messages.batches.results(batch.id):
+        i = int(entry.custom_id)
+        if entry.result.type != "succeeded":
+            log.warning(f"Claude batch entry {i} {entry.result.type}")
+            continue
+        message = entry.result.message
+        responses[i] = LLMResponse(
+            content="".join(b.text for b in message.content if hasattr(b, "text")),
+            model=models[i],
+            tokens_in=message.usage.input_tokens,
+            tokens_out=message.usage.output_tokens,
+            duration_ms=duration,
+        )
+    return responses
+
+
+async def call_gemini_batch(
+    requests: list[LLMRequest], api_key: str
+) -> list[LLMResponse]:
+    """Run requests through the Gemini Batch API (inlined requests).
+
+    A Gemini batch job targets a single model, so requests are grouped
+    by model and submitted as one job per group.
+    """
+    client = _get_gemini(api_key)
+    start = time.monotonic_ns()
+
+    groups: dict[str, list[int]] = {}
+    for i, request in enumerate(requests):
+        groups.setdefault(request.model or "gemini-3-flash-preview", []).append(i)
+
+    responses: list[LLMResponse | None] = [None] * len(requests)
+    for model, indices in groups.items():
+        inlined = []
+        for i in indices:
+            request = requests[i]
+            system_instruction, contents = _gemini_payload(request)
+            inlined.append({
+                "contents": contents,
+                "config": {
+                    "system_instruction": system_instruction,
+                    "temperature": request.temperature,
+                    "max_output_tokens": request.max_tokens,
+                },
+            })
+
+        job = await client.aio.batches.create(model=model, src=inlined)
+        while job.state.name not in _GEMINI_BATCH_DONE_STATES:
+            await asyncio.sleep(BATCH_POLL_INTERVAL)
+            job = await client.aio.batches.get(name=job.name)
+
+        duration = (time.monotonic_ns() - start) // 1_000_000
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            log.warning(f"Gemini batch {job.name} ended with {job.state.name}")
+        results = job.dest.inlined_responses if job.dest else []
+        for i, result in zip(indices, results or []):
+            response = result.response
+            if response is None:
+                continue
+            usage = response.usage_metadata
+            responses[i] = LLMResponse(
+                content=response.text or "",
+                model=model,
+                tokens_in=getattr(usage, "prompt_token_count", 0) or 0,
+                tokens_out=getattr(usage, "candidates_token_count", 0) or 0,
+                duration_ms=duration,
+            )
+        for i in indices:
+            if responses[i] is None:
+                responses[i] = LLMResponse(
+                    content="", model=model, tokens_in=0, tokens_out=0, duration_ms=duration,
+                )
+    return responses
+
+
+async def prewarm(model: str, gemini_key: str = "", anthropic_key: str = "") -> None:
+    """Open a pooled connection to the provider that will serve `model`.
+
+    Best-effort and cheap (a model metadata lookup), so TLS setup can overlap
+    earlier work instead of delaying the first generated token.
+    """
+    try:
+        if model.startswith("claude") and anthropic_key and _has_anthropic():
+            await _get_claude(anthropic_key).models.retrieve(model)
+        elif gemini_key and genai is not None:
+            await _get_gemini(gemini_key).aio.models.get(model=model)
+    except Exception as e:
+        log.debug(f"Prewarm for {model} failed: {e}")
+
+
 def _has_anthropic() -> bool:
     """Check if anthropic SDK is importable."""
-    try:
-        import anthropic  # noqa: F401
-        return True
-    except ImportError:
-        return False
+    return anthropic is not None
+
+
+def gemini_embedder(api_key: str, model: str = "gemini-embedding-001"):
+    """Return an async embed(text) function backed by the Gemini Embedding API.
+
+    Suitable as the `embed` argument of SemanticCache.
+    """
+
+    async def embed(text: str) -> list[float]:
+        result = await _get_gemini(api_key).aio.models.embed_content(
+            model=model,
+            contents=text,
+            config=genai_types.EmbedContentConfig(
+                task_type="SEMANTIC_SIMILARITY",
+                output_dimensionality=768,
+            ),
+        )
+        return result.embeddings[0].values
+
+    return embed
+
 
+# Model used for Claude requests when only Gemini is configured
+CLAUDE_FALLBACK_MODEL = "gemini-3-pro-preview"
 
-def create_llm_caller(gemini_key: str = "", anthropic_key: str = ""):
+
+def _provider_resolver(gemini_key: str, anthropic_key: str) -> Callable[[LLMRequest], str]:
+    """Build the routing decision shared by the caller factories.
+
+    Routing is resolved once from the configured keys, keyed by model family
+    (the model ID up to the first "-"). The returned function maps a request
+    to "gemini" or "claude", rewriting request.model for the Claude-to-Gemini
+    fallback and for the default model when none is set.
+    """
+    claude_available = bool(anthropic_key) and _has_anthropic()
+
+    # family -> (provider, model to substitute or None)
+    routes: dict[str, tuple[str, str | None]] = {}
+    if gemini_key:
+        routes["gemini"] = ("gemini", None)
+    if claude_available:
+        routes["claude"] = ("claude", None)
+    elif gemini_key:
+        routes["claude"] = ("gemini", CLAUDE_FALLBACK_MODEL)
+
+    default: tuple[str, str] | None = None
+    if gemini_key:
+        default = ("gemini", "gemini-3-flash-preview")
+    elif claude_available:
+        default = ("claude", "claude-sonnet-4-6")
+
+    def resolve(request: LLMRequest) -> str:
+        route = routes.get((request.model or "").split("-", 1)[0])
+        if route is None:
+            if default is None:
+                raise ValueError("No API keys configured or SDKs installed.")
+            provider, model = default
+            request.model = request.model or model
+            return provider
+        provider, fallback = route
+        if fallback:
+            # Claude requested but unavailable — fall back to Gemini
+            log.info(f"Claude unavailable, falling back to Gemini for {request.model}")
+            request.model = fallback
+        return provider
+
+    return resolve
+
+
+def create_llm_caller(
+    gemini_key: str = "",
+    anthropic_key: str = "",
+    semantic_cache: SemanticCache | None = None,
+):
     """Factory that returns an async llm_call function for the Pipeline.
 
     Routes to the appropriate provider based on the model ID in the request.
-    Falls back to Gemini if Claude SDK isn't installed.
+    Falls back to Gemini if Claude SDK isn't installed. If a SemanticCache is
+    given, near-duplicate low-temperature prompts are answered from it.
     """
-    claude_available = anthropic_key and _has_anthropic()
+    resolve = _provider_resolver(gemini_key, anthropic_key)
 
-    async def llm_call(request: LLMRequest) -> LLMResponse:
-        model = request.model or ""
-
-        # Route based on model name
-        if model.startswith("gemini") and gemini_key:
-            return await call_gemini(request, gemini_key)
-        elif model.startswith("claude") and claude_available:
-            return await call_claude(request, anthropic_key)
-        elif model.startswith("claude") and gemini_key:
-            # Claude requested but unavailable — fallback to Gemini
-            log.info(f"Claude unavailable, falling back to Gemini for {model}")
-            request.model = "gemini-3-pro-preview"
-            return await call_gemini(request, gemini_key)
-        elif gemini_key:
-            request.model = request.model or "gemini-3-flash-preview"
-            return await call_gemini(request, gemini_key)
-        elif claude_available:
-            request.model = request.model or "claude-sonnet-4-6"
+    async def route(request: LLMRequest) -> LLMResponse:
+        if resolve(request) == "claude":
             return await call_claude(request, anthropic_key)
-        else:
-            raise ValueError("No API keys configured or SDKs installed.")
+        return await call_gemini(request, gemini_key)
+
+    if semantic_cache is None:
+        return route
+
+    async def llm_call(request: LLMRequest) -> LLMResponse:
+        return await semantic_cache.get_or_call(request, route)
 
     return llm_call
 
@@ -320,33 +906,252 @@ def create_llm_caller(gemini_key: str = "", anthropic_key: str = ""):
 def create_streaming_caller(gemini_key: str = "", anthropic_key: str = ""):
     """Factory that returns an async streaming generator function for the Pipeline.
 
-    Same routing logic as create_llm_caller but yields token chunks.
+    Same routing logic as create_llm_caller but yields (kind, payload)
+    chunks — see TOKEN / DONE.
     """
-    claude_available = anthropic_key and _has_anthropic()
-
-    async def llm_stream(request: LLMRequest) -> AsyncIterator[dict]:
-        model = request.model or ""
-
-        if model.startswith("gemini") and gemini_key:
-            async for chunk in stream_gemini(request, gemini_key):
-                yield chunk
-        elif model.startswith("claude") and claude_available:
-            async for chunk in stream_claude(request, anthropic_key):
-                yield chunk
-        elif model.startswith("claude") and gemini_key:
-            log.info(f"Claude unavailable for streaming, falling back to Gemini")
-            request.model = "gemini-3-pro-preview"
-            async for chunk in stream_gemini(request, gemini_key):
-                yield chunk
-        elif gemini_key:
-            request.model = request.model or "gemini-3-flash-preview"
-            async for chunk in stream_gemini(request, gemini_key):
-                yield chunk
-        elif claude_available:
-            request.model = request.model or "claude-sonnet-4-6"
-            async for chunk in stream_claude(request, anthropic_key):
-                yield chunk
+    resolve = _provider_resolver(gemini_key, anthropic_key)
+
+    async def llm_stream(request: LLMRequest) -> AsyncIterator[tuple[str, Any]]:
+        if resolve(request) == "claude":
+            stream = stream_claude(request, anthropic_key)
         else:
-            raise ValueError("No API keys configured or SDKs installed.")
+            stream = stream_gemini(request, gemini_key)
+        async for chunk in stream:
+            yield chunk
 
     return llm_stream
+
+
+def create_batch_caller(gemini_key: str = "", anthropic_key: str = ""):
+    """Factory that returns an async llm_batch function for bulk requests.
+
+    Requests are routed per model family (same rules as create_llm_caller)
+    and submitted through the provider Batch APIs. Pass live=True to run
+    them as concurrent live calls instead, for latency-sensitive callers.
+    """
+    resolve = _provider_resolver(gemini_key, anthropic_key)
+    llm_call = create_llm_caller(gemini_key, anthropic_key)
+
+    async def llm_batch(requests: list[LLMRequest], live: bool = False) -> list[LLMResponse]:
+        if live:
+            return await call_many(requests, llm_call)
+
+        gemini_idx: list[int] = []
+        claude_idx: list[int] = []
+        for i, request in enumerate(requests):
+            if resolve(request) == "claude":
+                claude_idx.append(i)
+            else:
+                gemini_idx.append(i)
+
+        jobs = []
+        if gemini_idx:
+            batch = [requests[i] for i in gemini_idx]
+            jobs.append((gemini_idx, call_gemini_batch(batch, gemini_key)))
+        if claude_idx:
+            batch = [requests[i] for i in claude_idx]
+            jobs.append((claude_idx, call_claude_batch(batch, anthropic_key)))
+
+        results: list[LLMResponse | None] = [None] * len(requests)
+        batches = await asyncio.gather(*(job for _, job in jobs))
+        for (indices, _), responses in zip(jobs, batches):
+            for i, response in zip(indices, responses):
+                results[i] = response
+        return results
+
+    return llm_batch
+
+
+# ---------------------------------------------------------------------------
+# Bounded fan-out — cap in-flight calls and requests-per-minute
+# ---------------------------------------------------------------------------
+
+
+class _RateLimiter:
+    """Sliding-window limiter: at most `rate` acquisitions per `period` seconds."""
+
+    def __init__(self, rate: int, period: float = 60.0) -> None:
+        self._rate = rate
+        self._period = period
+        self._stamps: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._stamps and now - self._stamps[0] >= self._period:
+                    self._stamps.popleft()
+                if len(self._stamps) < self._rate:
+                    self._stamps.append(now)
+                    return
+                await asyncio.sleep(self._period - (now - self._stamps[0]))
+
+
+def create_bounded_caller(
+    gemini_key: str = "",
+    anthropic_key: str = "",
+    max_concurrency: int = 10,
+    rpm: int = 100,
+    provider_rpm: dict[str, int] | None = None,
+):
+    """Factory like create_llm_caller, but safe to fan out many calls at once.
+
+    A semaphore caps in-flight requests at max_concurrency and a sliding
+    window caps requests per minute, so bursts queue locally instead of
+    turning into provider 429s. provider_rpm (e.g. {"gemini": 60}) gives a
+    provider its own budget; others share the global rpm.
+    """
+    llm_call = create_llm_caller(gemini_key, anthropic_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    default_limiter = _RateLimiter(rpm)
+    limiters = {name: _RateLimiter(limit) for name, limit in (provider_rpm or {}).items()}
+
+    async def bounded_call(request: LLMRequest) -> LLMResponse:
+        provider = (request.model or "").split("-", 1)[0]
+        limiter = limiters.get(provider, default_limiter)
+        async with semaphore:
+            await limiter.acquire()
+            return await llm_call(request)
+
+    return bounded_call
+
+
+async def run_many(
+    requests: list[LLMRequest],
+    llm_call: Callable[[LLMRequest], Awaitable[LLMResponse]],
+    max_concurrency: int = 10,
+    on_progress: Callable[[int, int], Any] | None = None,
+) -> AsyncIterator[tuple[int, LLMResponse]]:
+    """Yield (index, response) pairs as calls complete.
+
+    Keeps at most max_concurrency tasks outstanding, spawning the next
+    request as each one finishes. on_progress(done, total) is called after
+    every completion.
+    """
+    total = len(requests)
+    pending: set[asyncio.Task] = set()
+    next_index = 0
+    done_count = 0
+
+    async def _one(i: int, request: LLMRequest) -> tuple[int, LLMResponse]:
+        return i, await llm_call(request)
+
+    try:
+        while next_index < total or pending:
+            while next_index < total and len(pending) < max_concurrency:
+                pending.add(asyncio.create_task(_one(next_index, requests[next_index])))
+                next_index += 1
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                done_count += 1
+                if on_progress:
+                    on_progress(done_count, total)
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def call_many(
+    requests: list[LLMRequest],
+    llm_call: Callable[[LLMRequest], Awaitable[LLMResponse]],
+    max_concurrency: int = 10,
+) -> list[LLMResponse]:
+    """Run requests concurrently and return responses in request order.
+
+    On the first failure the remaining calls are cancelled and awaited
+    before the exception propagates, so no task (or its socket) outlives
+    the call — TaskGroup semantics, kept 3.10-compatible.
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _one(request: LLMRequest) -> LLMResponse:
+        async with sem:
+            return await llm_call(request)
+
+    tasks = [asyncio.create_task(_one(r)) for r in requests]
+    if not tasks:
+        return []
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+    return [task.result() for task in tasks]
+
+
+class BatchCoalescer:
+    """Coalesce calls arriving within a short window into one batched call.
+
+    `run` receives up to max_batch items (in arrival order) and must return
+    one result per item, in the same order. A batch is dispatched once it
+    is full or wait_ms has passed since its first item arrived.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[list[Any]], Awaitable[list[Any]]],
+        max_batch: int = 8,
+        wait_ms: float = 15,
+    ) -> None:
+        self._run = run
+        self._max_batch = max_batch
+        self._wait = wait_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._dispatches: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._collect())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._wait
+            while len(batch) < self._max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Dispatch without blocking so the next batch can form meanwhile
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        # Callers that gave up (timeout/cancel) are dropped from the batch
+        live = [(item, future) for item, future in batch if not future.done()]
+        if not live:
+            return
+        try:
+            results = await self._run([item for item, _ in live])
+            if len(results) != len(live):
+                raise ValueError(f"Batch returned {len(results)} results for {len(live)} items")
+        except Exception as e:
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(live, results):
+            if future.done():
+                continue
+            # run() may return per-item exceptions (gather(return_exceptions=True))
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,168 @@
+"""Response caches for LLM calls.
+
+LLMCache — exact match on the full request. Only near-zero temperature
+requests are cached; anything sampled with real randomness is expected
+to vary between calls, so caching it would change behavior. Entries live
+in-process (LRU + TTL).
+
+SemanticCache — opt-in, embedding-similarity match for near-duplicate
+prompts (whitespace/phrasing differences). Uses cosine similarity over
+normalized vectors, no numpy needed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+import orjson
+
+from aus.models import LLMRequest, LLMResponse
+
+log = logging.getLogger("aus.llm.cache")
+
+# Requests above this temperature are never cached
+MAX_CACHEABLE_TEMPERATURE = 0.05
+
+
+def _canonical(obj: Any) -> bytes:
+    """Deterministic JSON bytes for hashing (sorted keys)."""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+
+class LLMCache:
+    """In-process LRU cache of LLMResponse payloads keyed by request hash."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600) -> None:
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def cache_key(
+        model: str, messages: list[Any], temperature: float, max_tokens: int
+    ) -> str | None:
+        """Hash the request, or return None if it isn't deterministic enough to cache."""
+        if temperature > MAX_CACHEABLE_TEMPERATURE:
+            return None
+        payload = {
+            "model": model,
+            "messages": [[m.role, m.content] for m in messages],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        return hashlib.sha256(_canonical(payload)).hexdigest()
+
+    def key_for(self, request: LLMRequest, model: str) -> str | None:
+        return self.cache_key(model, request.messages, request.temperature, request.max_tokens)
+
+    async def get(self, key: str) -> LLMResponse | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return LLMResponse(**{**entry[1], "duration_ms": 0})
+
+    async def set(self, key: str, response: LLMResponse) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, response.model_dump())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def log_stats(self) -> None:
+        log.info(
+            "LLM cache: %d hits, %d misses, %d entries",
+            self.stats["hits"], self.stats["misses"], len(self._entries),
+        )
+
+
+response_cache = LLMCache()
+
+
+class SemanticCache:
+    """Embedding-similarity cache for near-duplicate prompts.
+
+    Entries are partitioned by (model, system prompt) so a hit is only
+    possible when everything but the conversation text matches exactly.
+    The conversation text is embedded with the supplied async `embed`
+    function; a stored response is reused when cosine >= threshold.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Awaitable[list[float]]],
+        threshold: float = 0.92,
+        max_entries: int = 512,
+        max_temperature: float = 0.3,
+    ) -> None:
+        self._embed = embed
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._max_temperature = max_temperature
+        self._partitions: dict[str, list[tuple[list[float], dict[str, Any]]]] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _partition(request: LLMRequest) -> str:
+        system = [m.content for m in request.messages if m.role == "system"]
+        return hashlib.sha256(_canonical([request.model or "", system])).hexdigest()
+
+    @staticmethod
+    def _normalize(vec: list[float]) -> list[float]:
+        norm = math.sqrt(sum(x * x for x in vec))
+        return [x / norm for x in vec] if norm else list(vec)
+
+    async def get_or_call(
+        self,
+        request: LLMRequest,
+        call: Callable[[LLMRequest], Awaitable[LLMResponse]],
+        text: str | None = None,
+        accept: Callable[[LLMResponse], bool] | None = None,
+    ) -> LLMResponse:
+        """Return a cached near-duplicate response, or call through and remember it.
+
+        `text` is what gets embedded; it defaults to the conversation text.
+        Callers whose prompts share a long fixed prefix should pass only the
+        variable part, or unrelated prompts will look near-identical.
+        A fresh response is only remembered if `accept` (when given) passes it.
+        """
+        if request.temperature >= self._max_temperature:
+            return await call(request)
+
+        if text is None:
+            text = "\n".join(m.content for m in request.messages if m.role != "system")
+        try:
+            vec = self._normalize(await self._embed(text))
+        except Exception as e:
+            log.debug(f"Semantic cache embedding failed, skipping: {e}")
+            return await call(request)
+
+        entries = self._partitions.setdefault(self._partition(request), [])
+        best_score, best = 0.0, None
+        for stored_vec, payload in entries:
+            score = sum(x * y for x, y in zip(vec, stored_vec))
+            if score > best_score:
+                best_score, best = score, payload
+        if best is not None and best_score >= self._threshold:
+            self.stats["hits"] += 1
+            return LLMResponse(**{**best, "duration_ms": 0})
+
+        self.stats["misses"] += 1
+        response = await call(request)
+        if response.content and (accept is None or accept(response)):
+            entries.append((vec, response.model_dump()))
+            if len(entries) > self._max_entries:
+                del entries[0]
+        return response
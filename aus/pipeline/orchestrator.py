@@ -10,8 +10,15 @@ conversation across phases.
 from __future__ import annotations
 
 import time
+import re
+import asyncio
+import contextlib
+import functools
 import logging
-from typing import AsyncIterator
+from enum import Enum
+from collections.abc import AsyncIterator
+
+import orjson
 
 from aus.models import (
     Phase,
@@ -35,12 +42,341 @@ from aus.prompts import (
     REFINER_PROMPT,
 )
 from aus.generators.parser import parse_files_from_response, parse_deps_from_response
-from aus.generators.parser import FILE_PATTERN
-from aus.pipeline.router import select_model
+from aus.generators.parser import FILE_PATTERN, _clean_content, _infer_role, _infer_language
+from aus.generators.llm import (
+    DEFAULT_RETRY,
+    DONE,
+    FALLBACK_RETRY,
+    TOKEN,
+    is_transient_error,
+    prewarm,
+    retry_budget,
+)
+from aus.pipeline.router import build_model_table
 
 log = logging.getLogger("aus.pipeline")
 
 
+# Byte-stable system prompts keep provider-side prompt caches warm: the LLM
+# layer marks long system prompts cacheable (Claude cache_control, Gemini
+# cached_content), so they must not vary between calls.
+_ITERATE_SYSTEM_PROMPT = SYSTEM_PROMPT + "\n\n" + REFINER_PROMPT
+
+
+@functools.lru_cache(maxsize=8)
+def _compose_system_prompt(stack: Stack) -> str:
+    """System prompt for GENERATE: base prompt plus the stack-specific prompts."""
+    system_parts = [SYSTEM_PROMPT]
+    if stack in (Stack.REACT_FASTAPI, Stack.REACT_ONLY):
+        system_parts.append(FRONTEND_PROMPT)
+    if stack in (Stack.REACT_FASTAPI, Stack.FASTAPI_ONLY):
+        system_parts.append(BACKEND_PROMPT)
+    if stack != Stack.REACT_ONLY:
+        system_parts.append(DATABASE_PROMPT)
+    return "\n\n---\n\n".join(system_parts)
+
+
+_END_FILE_MARKER = "### END FILE"
+
+# Streamed tokens are coalesced into one SSE "token" event per this many
+# chunks or this many seconds, whichever comes first.
+TOKEN_FLUSH_COUNT = 16
+TOKEN_FLUSH_INTERVAL = 0.02
+
+
+class _FileScanner:
+    """Accumulates streamed text and finds completed ### FILE blocks.
+
+    Text before the last completed block is kept as a list of chunks and
+    only joined on demand (text()), so the per-token cost is bounded by the
+    size of the block currently being written rather than the whole output.
+    FILE_PATTERN only runs when a new END FILE marker has arrived.
+    """
+
+    def __init__(self) -> None:
+        self._done: list[str] = []  # text up to the end of the last completed block
+        self._tail = ""  # text after it, where the next block is forming
+        self._checked = 0  # marker search in _tail resumes here
+
+    def feed(self, chunk: str) -> list[re.Match[str]]:
+        tail = self._tail + chunk
+        self._tail = tail
+        resume = max(0, len(tail) - len(_END_FILE_MARKER) + 1)
+        if tail.find(_END_FILE_MARKER, self._checked) == -1:
+            self._checked = resume
+            return []
+        matches = list(FILE_PATTERN.finditer(tail))
+        if matches:
+            end = matches[-1].end()
+            self._done.append(tail[:end])
+            self._tail = tail[end:]
+            resume = max(0, resume - end)
+        self._checked = resume
+        return matches
+
+    def text(self) -> str:
+        return "".join(self._done) + self._tail
+
+
+# Chunks the provider read loop may run ahead of a slow SSE consumer
+STREAM_BUFFER_SIZE = 256
+
+
+async def _buffered(source: AsyncIterator, maxsize: int = STREAM_BUFFER_SIZE) -> AsyncIterator:
+    """Iterate `source` from a background task through a bounded queue.
+
+    Keeps draining the provider stream while the consumer is blocked on a
+    slow client, so the provider's read side doesn't stall or time out.
+    Errors from `source` are re-raised to the consumer.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def produce() -> None:
+        try:
+            async for item in source:
+                await queue.put((True, item))
+        except Exception as e:
+            await queue.put((False, e))
+        else:
+            await queue.put((False, None))
+        finally:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            ok, item = await queue.get()
+            if ok:
+                yield item
+            elif item is None:
+                return
+            else:
+                raise item
+    finally:
+        # Wait for the producer's cleanup (source.aclose) so its errors surface here
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await producer
+
+
+def _parse_output(text: str) -> tuple[list[ProjectFile], list, list]:
+    """Parse an LLM response into (files, frontend_deps, backend_deps)."""
+    frontend_deps, backend_deps = parse_deps_from_response(text)
+    return parse_files_from_response(text), frontend_deps, backend_deps
+
+
+def _spec_summary(spec: Spec) -> str:
+    """PLAN's spec block — identical text for identical specs."""
+    return (
+        f"Stack: {spec.stack.value}\n"
+        f"Complexity: {spec.complexity.value}\n"
+        f"Auth: {spec.auth_strategy}\n"
+        f"Database: {spec.database}\n"
+        f"Frontend: {spec.frontend_stack}\n"
+        f"Backend: {spec.backend_stack}\n"
+    )
+
+
+# ANALYZE fast path: short requests whose needs are obvious from keywords
+# skip the classifier LLM call. Anything mentioning the stack is left to it.
+FAST_ANALYZE_MAX_CHARS = 80
+_STACK_HINT_RE = re.compile(
+    r"\b(frontend|backend|react|fastapi|api|static|landing page|cli|server)\b"
+)
+_AUTH_RE = re.compile(r"\b(login|log in|sign ?in|sign ?up|auth\w*|accounts?|passwords?|register)\b")
+_DATABASE_RE = re.compile(
+    r"\b(database|db|store|stores|save|saves|persist\w*|crud|track\w*|todos?|tasks?|inventory)\b"
+)
+_COMPLEX_RE = re.compile(r"\b(dashboard|multi\w*|real-?time|admin|analytics|payments?|chat)\b")
+
+
+def _fast_analyze(user_request: str) -> dict | None:
+    """Classify a short request by keywords, or None if the LLM should decide."""
+    text = user_request.lower()
+    if len(text) >= FAST_ANALYZE_MAX_CHARS or _STACK_HINT_RE.search(text):
+        return None
+
+    needs_auth = bool(_AUTH_RE.search(text))
+    needs_database = bool(_DATABASE_RE.search(text))
+    if not (needs_auth or needs_database):
+        return None
+
+    if _COMPLEX_RE.search(text):
+        complexity = "complex"
+    elif needs_auth:
+        complexity = "standard"
+    else:
+        complexity = "simple"
+    return {
+        "complexity": complexity,
+        "stack": "react-fastapi",
+        "features": [],
+        "needs_auth": needs_auth,
+        "needs_database": needs_database,
+    }
+
+
+# VALIDATE placeholder checks
+_PLACEHOLDER_RE = re.compile(r"// TODO|# TODO")
+_DOTS_LINE_RE = re.compile(r"^[ \t]*\.\.\.[ \t]*\r?$", re.MULTILINE)
+_DOTS_LANGUAGES = frozenset({"tsx", "ts", "py"})
+
+
+def _validate_file(path: str, content: str, language: str) -> list[str]:
+    """Per-file VALIDATE checks: placeholders and near-empty files."""
+    errors = []
+    if _PLACEHOLDER_RE.search(content):
+        errors.append(f"Placeholder found in {path}")
+    if language in _DOTS_LANGUAGES and len(_DOTS_LINE_RE.findall(content)) > 2:
+        # Allow ... in Python (Ellipsis literal) but flag suspicious use
+        errors.append(f"Suspected placeholder '...' in {path}")
+    if len(content.strip()) < 10:
+        errors.append(f"Nearly empty file: {path}")
+    return errors
+
+
+def _validate_project_structure(project: Project, spec: Spec) -> list[str]:
+    """Project-level VALIDATE checks: any files at all, entry points present."""
+    errors = []
+
+    # Check: at least one file generated
+    if not project.files:
+        errors.append("No files were generated")
+
+    # Check: entry point exists
+    if spec.stack in (Stack.REACT_FASTAPI, Stack.REACT_ONLY):
+        if not project.get_file("frontend/src/App.tsx"):
+            errors.append("Missing frontend entry point: frontend/src/App.tsx")
+
+    if spec.stack in (Stack.REACT_FASTAPI, Stack.FASTAPI_ONLY):
+        if not project.get_file("backend/app/main.py"):
+            errors.append("Missing backend entry point: backend/app/main.py")
+
+    return errors
+
+
+def _merge_files(existing: list, changed: list) -> list:
+    """Replace files by path, keeping their position; new paths go last."""
+    if not changed:
+        return existing
+    merged = {f.path: f for f in existing}
+    for f in changed:
+        merged[f.path] = f
+    return list(merged.values())
+
+
+def _merge_deps(existing: list, new: list) -> list:
+    """Merge dependency lists by name; a newly parsed version wins."""
+    if not new:
+        return existing
+    merged = {d.name: d for d in existing}
+    merged.update((d.name, d) for d in new)
+    return list(merged.values())
+
+
+def _merge_project(existing: Project, files: list, deps_f: list, deps_b: list) -> Project:
+    """Next version of `existing` with ITERATE's changed files and deps merged in.
+
+    Built with model_construct: every input is already a validated model
+    (the project itself, and files/deps from the response parser), so a
+    schema walk over every file would only repeat that work.
+    """
+    return type(existing).model_construct(**{
+        **existing.__dict__,
+        "files": _merge_files(existing.files, files),
+        "version": existing.version + 1,
+        "frontend_deps": _merge_deps(existing.frontend_deps, deps_f),
+        "backend_deps": _merge_deps(existing.backend_deps, deps_b),
+    })
+
+
+# ITERATE context: projects up to this size are sent in full. Larger ones
+# list every path but send content only for the files the change request
+# most likely touches; the model may not rewrite files it hasn't seen.
+ITERATE_FULL_CONTEXT_CHARS = 60_000
+ITERATE_MAX_FOCUS_FILES = 8
+_ENTRY_POINTS = ("frontend/src/App.tsx", "backend/app/main.py")
+_KEYWORD_RE = re.compile(r"[a-z0-9_]{3,}")
+# Request words too common to say anything about which file is meant
+_STOPWORDS = frozenset(
+    "the and for with that this from into when then than make add change update "
+    "fix use using should would could can also new all any some more less page "
+    "app file files code please want need like just".split()
+)
+
+
+def _focus_files(files: list[ProjectFile], user_request: str) -> list[ProjectFile]:
+    """Rank files by keyword overlap with the request (path hits weigh more).
+
+    Content only counts whole-identifier matches, and stopwords are ignored,
+    so generic request words don't make every file score.
+    """
+    keywords = set(_KEYWORD_RE.findall(user_request.lower())) - _STOPWORDS
+    scored = []
+    for f in files:
+        path = f.path.lower()
+        idents = set(_KEYWORD_RE.findall(f.content.lower()))
+        score = sum(3 if k in path else 1 if k in idents else 0 for k in keywords)
+        if score and f.path in _ENTRY_POINTS:
+            score += 1
+        if score:
+            scored.append((score, f))
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    focus = [f for _, f in scored[:ITERATE_MAX_FOCUS_FILES]]
+    if not focus:
+        focus = [f for f in files if f.path in _ENTRY_POINTS]
+    return focus
+
+
+def _iterate_prompt(
+    user_request: str, project: Project, include_full: bool = False
+) -> tuple[str, set[str]]:
+    """User message for ITERATE, plus the paths whose content it leaves out."""
+    file_tree = "\n".join(project.file_tree())
+    files = project.files
+    omitted_paths: set[str] = set()
+    if not include_full and sum(len(f.content) for f in files) > ITERATE_FULL_CONTEXT_CHARS:
+        focus = _focus_files(files, user_request)
+        focus_paths = {f.path for f in focus}
+        omitted_paths = {f.path for f in files} - focus_paths
+        files = focus
+        omitted = (
+            "Only the files shown above have their content included. The other "
+            "files in the tree must NOT be output: you may change the files shown "
+            "or add new files, but never rewrite a file whose content you haven't "
+            "seen.\n\n"
+        )
+    else:
+        omitted = ""
+
+    file_contents = "".join(
+        f"\n### FILE: {f.path}\n{f.content}\n### END FILE\n" for f in files
+    )
+    prompt = (
+        f"Here is the current project:\n\n"
+        f"File tree:\n{file_tree}\n\n"
+        f"Files:\n{file_contents}\n\n"
+        f"{omitted}"
+        f"Change request: {user_request}\n\n"
+        f"Output ONLY the files that need to change, using ### FILE: markers. "
+        f"Each file must be complete (not a diff)."
+    )
+    return prompt, omitted_paths
+
+
+def _drop_blind_edits(files: list, omitted_paths: set[str]) -> list:
+    """Discard rewrites of files ITERATE never saw, so their content isn't lost."""
+    if not omitted_paths:
+        return files
+    blind = [f.path for f in files if f.path in omitted_paths]
+    if not blind:
+        return files
+    log.warning(f"ITERATE rewrote {len(blind)} file(s) it wasn't shown, ignoring: {blind}")
+    return [f for f in files if f.path not in omitted_paths]
+
+
 class Pipeline:
     """Orchestrates the 6-phase generation pipeline.
 
@@ -58,13 +394,16 @@ class Pipeline:
         self._llm_stream = llm_stream
         self._gemini_key = gemini_key
         self._anthropic_key = anthropic_key
+        self._model_for_phase = build_model_table(gemini_key, anthropic_key)
         self._phases: list[PhaseResult] = []
+        self._streamed_checks: dict[str, tuple[str, list[str]]] = {}
 
     async def run(
         self,
         user_request: str,
         spec: Spec | None = None,
         existing_project: Project | None = None,
+        include_full: bool = False,
     ) -> GenerationResult:
         """Execute the full pipeline.
 
@@ -72,29 +411,31 @@ class Pipeline:
             user_request: Natural language description of what to build/change.
             spec: Optional pre-built spec. If None, one is generated.
             existing_project: If provided, this is a refinement (ITERATE phase).
+            include_full: ITERATE only — send every file's content even for
+                large projects instead of a file list plus focus files.
         """
         start = time.time()
         self._phases = []
 
         # If we have an existing project, skip to ITERATE
         if existing_project:
-            return await self._iterate(user_request, existing_project)
-
-        # Phase 1: ANALYZE — classify the request
-        analysis = await self._analyze(user_request)
+            return await self._iterate(user_request, existing_project, include_full)
 
-        # Phase 2: SPEC — generate or validate spec
+        # Phase 1 + 2: ANALYZE → SPEC, only needed when no spec was given
         if spec is None:
+            analysis = await self._analyze(user_request)
             spec = self._spec_from_analysis(analysis, user_request)
 
-        # Phase 3: PLAN — produce technical plan
-        plan = await self._plan(user_request, spec)
+        # Phase 3: PLAN — produce technical plan, warming GENERATE's provider meanwhile
+        plan, _ = await asyncio.gather(
+            self._plan(user_request, spec), self._warmup_generate()
+        )
 
         # Phase 4: GENERATE — produce all code
         project = await self._generate(user_request, spec, plan)
 
         # Phase 5: VALIDATE — structural checks
-        errors = self._validate(project, spec)
+        errors = await asyncio.to_thread(self._validate, project, spec)
 
         total_ms = int((time.time() - start) * 1000)
         total_tokens = sum(p.tokens_used for p in self._phases)
@@ -117,6 +458,7 @@ class Pipeline:
         user_request: str,
         spec: Spec | None = None,
         existing_project: Project | None = None,
+        include_full: bool = False,
     ) -> AsyncIterator[dict]:
         """Execute the pipeline, streaming events as they happen.
 
@@ -131,27 +473,29 @@ class Pipeline:
         self._phases = []
 
         if existing_project:
-            async for event in self._stream_iterate(user_request, existing_project):
+            async for event in self._stream_iterate(user_request, existing_project, include_full):
                 yield event
         else:
-            # Phase 1: ANALYZE (non-streaming — fast)
-            yield {"event": "phase", "data": {"phase": "ANALYZE", "status": "started"}}
-            analysis = await self._analyze(user_request)
-            yield {"event": "phase", "data": {
-                "phase": "ANALYZE", "status": "completed",
-                "duration_ms": self._phases[-1].duration_ms,
-                "model": self._phases[-1].model or "",
-                "tokens_used": self._phases[-1].tokens_used,
-            }}
-
-            # Phase 2: SPEC (no LLM call)
             if spec is None:
+                # Phase 1: ANALYZE (non-streaming — fast)
+                yield {"event": "phase", "data": {"phase": "ANALYZE", "status": "started"}}
+                analysis = await self._analyze(user_request)
+                yield {"event": "phase", "data": {
+                    "phase": "ANALYZE", "status": "completed",
+                    "duration_ms": self._phases[-1].duration_ms,
+                    "model": self._phases[-1].model or "",
+                    "tokens_used": self._phases[-1].tokens_used,
+                }}
+
+                # Phase 2: SPEC (no LLM call)
                 spec = self._spec_from_analysis(analysis, user_request)
             yield {"event": "phase", "data": {"phase": "SPEC", "status": "completed"}}
 
-            # Phase 3: PLAN (non-streaming — moderate)
+            # Phase 3: PLAN (non-streaming — moderate), warming GENERATE's provider meanwhile
             yield {"event": "phase", "data": {"phase": "PLAN", "status": "started"}}
-            plan = await self._plan(user_request, spec)
+            plan, _ = await asyncio.gather(
+                self._plan(user_request, spec), self._warmup_generate()
+            )
             yield {"event": "phase", "data": {
                 "phase": "PLAN", "status": "completed",
                 "duration_ms": self._phases[-1].duration_ms,
@@ -167,7 +511,9 @@ class Pipeline:
 
             # Phase 5: VALIDATE
             project = self._last_generated_project
-            errors = self._validate(project, spec)
+            errors = await asyncio.to_thread(
+                self._validate, project, spec, self._streamed_checks
+            )
             yield {"event": "phase", "data": {
                 "phase": "VALIDATE", "status": "completed" if not errors else "failed",
                 "errors": errors,
@@ -194,6 +540,14 @@ class Pipeline:
         """Classify the request: complexity, stack, key features."""
         start = time.time()
 
+        analysis = _fast_analyze(user_request)
+        if analysis is not None:
+            self._phases.append(
+                PhaseResult(phase=Phase.ANALYZE, success=True, output=analysis)
+            )
+            log.info(f"ANALYZE fast path (no LLM call): {analysis}")
+            return analysis
+
         request = LLMRequest(
             messages=[
                 LLMMessage(role="system", content=PLANNER_PROMPT),
@@ -213,18 +567,22 @@ class Pipeline:
             ],
             temperature=0.1,
             max_tokens=500,
-            model=select_model(Phase.ANALYZE, self._gemini_key, self._anthropic_key),
+            model=self._model_for_phase[Phase.ANALYZE],
         )
 
         response = await self._llm(request)
         duration = int((time.time() - start) * 1000)
 
-        # Parse JSON from response
-        import json
+        # Parse JSON from response, unwrapping a ```json fence if present
+        body = response.content.strip()
+        if body.startswith("```"):
+            body = body.split("```", 2)[1].removeprefix("json").strip()
 
         try:
-            analysis = json.loads(response.content.strip().strip("```json").strip("```"))
-        except json.JSONDecodeError:
+            analysis = orjson.loads(body)
+            if not isinstance(analysis, dict):
+                raise orjson.JSONDecodeError("expected a JSON object", body, 0)
+        except orjson.JSONDecodeError:
             analysis = {
                 "complexity": "standard",
                 "stack": "react-fastapi",
@@ -277,14 +635,7 @@ class Pipeline:
         """Generate a technical plan from the spec."""
         start = time.time()
 
-        spec_summary = (
-            f"Stack: {spec.stack.value}\n"
-            f"Complexity: {spec.complexity.value}\n"
-            f"Auth: {spec.auth_strategy}\n"
-            f"Database: {spec.database}\n"
-            f"Frontend: {spec.frontend_stack}\n"
-            f"Backend: {spec.backend_stack}\n"
-        )
+        spec_summary = _spec_summary(spec)
 
         request = LLMRequest(
             messages=[
@@ -293,15 +644,15 @@ class Pipeline:
                     role="user",
                     content=(
                         f"Create a technical plan for this application.\n\n"
-                        f"User Request: {user_request}\n\n"
                         f"Spec:\n{spec_summary}\n\n"
+                        f"User Request: {user_request}\n\n"
                         f"Follow the plan format exactly."
                     ),
                 ),
             ],
             temperature=0.2,
             max_tokens=4000,
-            model=select_model(Phase.PLAN, self._gemini_key, self._anthropic_key),
+            model=self._model_for_phase[Phase.PLAN],
         )
 
         response = await self._llm(request)
@@ -324,6 +675,11 @@ class Pipeline:
     # Phase 4: GENERATE
     # ------------------------------------------------------------------
 
+    async def _warmup_generate(self) -> None:
+        """Open a connection to the GENERATE model's provider ahead of time."""
+        model = self._model_for_phase[Phase.GENERATE]
+        await prewarm(model, self._gemini_key, self._anthropic_key)
+
     async def _generate(self, user_request: str, spec: Spec, plan: str) -> Project:
         """Generate all code files based on spec and plan.
 
@@ -333,17 +689,9 @@ class Pipeline:
         start = time.time()
 
         # Build the generation prompt by combining system + stack-specific prompts
-        system_parts = [SYSTEM_PROMPT]
-        if spec.stack in (Stack.REACT_FASTAPI, Stack.REACT_ONLY):
-            system_parts.append(FRONTEND_PROMPT)
-        if spec.stack in (Stack.REACT_FASTAPI, Stack.FASTAPI_ONLY):
-            system_parts.append(BACKEND_PROMPT)
-        if spec.stack != Stack.REACT_ONLY:
-            system_parts.append(DATABASE_PROMPT)
+        system_prompt = _compose_system_prompt(spec.stack)
 
-        system_prompt = "\n\n---\n\n".join(system_parts)
-
-        primary_model = select_model(Phase.GENERATE, self._gemini_key, self._anthropic_key)
+        primary_model = self._model_for_phase[Phase.GENERATE]
 
         # Fallback models if primary returns empty (RECITATION, etc.)
         fallback_models = []
@@ -356,31 +704,44 @@ class Pipeline:
 
         models_to_try = [primary_model] + fallback_models
 
+        messages = [
+            LLMMessage(role="system", content=system_prompt),
+            LLMMessage(
+                role="user",
+                content=(
+                    f"Generate a complete application based on this plan.\n\n"
+                    f"User Request: {user_request}\n\n"
+                    f"Technical Plan:\n{plan}\n\n"
+                    f"Generate ALL files using ### FILE: markers. "
+                    f"Follow the generation order specified in the system prompt. "
+                    f"Every file must be complete and runnable."
+                ),
+            ),
+        ]
+
         response = None
         used_model = primary_model
+        last_error: Exception | None = None
 
         for model_id in models_to_try:
-            request = LLMRequest(
-                messages=[
-                    LLMMessage(role="system", content=system_prompt),
-                    LLMMessage(
-                        role="user",
-                        content=(
-                            f"Generate a complete application based on this plan.\n\n"
-                            f"User Request: {user_request}\n\n"
-                            f"Technical Plan:\n{plan}\n\n"
-                            f"Generate ALL files using ### FILE: markers. "
-                            f"Follow the generation order specified in the system prompt. "
-                            f"Every file must be complete and runnable."
-                        ),
-                    ),
-                ],
-                temperature=0.3,
-                max_tokens=32000,
-                model=model_id,
+            # Messages are validated once above; skip re-validation per attempt
+            request = LLMRequest.model_construct(
+                messages=messages, temperature=0.3, max_tokens=32000, model=model_id,
             )
-
-            response = await self._llm(request)
+            # With a fallback still to try, retry this model only briefly
+            policy = DEFAULT_RETRY if model_id == models_to_try[-1] else FALLBACK_RETRY
+
+            try:
+                with retry_budget(policy):
+                    response = await self._llm(request)
+            except Exception as e:
+                if not is_transient_error(e):
+                    raise
+                log.warning(
+                    f"GENERATE failed on {model_id} ({type(e).__name__}), trying fallback..."
+                )
+                last_error = e
+                continue
             used_model = model_id
 
             if response.content.strip():
@@ -389,11 +750,13 @@ class Pipeline:
             else:
                 log.warning(f"GENERATE returned empty from {model_id}, trying fallback...")
 
+        if response is None:
+            raise last_error
+
         duration = int((time.time() - start) * 1000)
 
         # Parse files from the response
-        files = parse_files_from_response(response.content)
-        frontend_deps, backend_deps = parse_deps_from_response(response.content)
+        files, frontend_deps, backend_deps = _parse_output(response.content)
 
         project = Project(
             name=spec.name,
@@ -424,47 +787,28 @@ class Pipeline:
     # Phase 5: VALIDATE
     # ------------------------------------------------------------------
 
-    def _validate(self, project: Project, spec: Spec) -> list[str]:
-        """Structural validation of generated project."""
+    def _validate(
+        self,
+        project: Project,
+        spec: Spec,
+        checked: dict[str, tuple[str, list[str]]] | None = None,
+    ) -> list[str]:
+        """Structural validation of generated project.
+
+        `checked` maps path → (content, errors) for files already validated
+        while streaming; those are reused when the content is unchanged.
+        """
         start = time.time()
-        errors = []
+        errors = _validate_project_structure(project, spec)
 
-        # Check: at least one file generated
-        if not project.files:
-            errors.append("No files were generated")
-
-        # Check: entry point exists
-        if spec.stack in (Stack.REACT_FASTAPI, Stack.REACT_ONLY):
-            if not project.get_file("frontend/src/App.tsx"):
-                errors.append("Missing frontend entry point: frontend/src/App.tsx")
-
-        if spec.stack in (Stack.REACT_FASTAPI, Stack.FASTAPI_ONLY):
-            if not project.get_file("backend/app/main.py"):
-                errors.append("Missing backend entry point: backend/app/main.py")
-
-        # Check: no placeholder code
+        # Check: no placeholder code, no empty files
+        checked = checked or {}
         for f in project.files:
-            if "// TODO" in f.content or "# TODO" in f.content:
-                errors.append(f"Placeholder found in {f.path}")
-            if "..." in f.content and f.language in ("tsx", "ts", "py"):
-                # Allow ... in Python (Ellipsis literal) but flag suspicious use
-                lines_with_dots = [
-                    line.strip()
-                    for line in f.content.split("\n")
-                    if line.strip() == "..."
-                ]
-                if len(lines_with_dots) > 2:
-                    errors.append(f"Suspected placeholder '...' in {f.path}")
-
-        # Check: no empty files
-        for f in project.files:
-            if len(f.content.strip()) < 10:
-                errors.append(f"Nearly empty file: {f.path}")
-
-        # Check: imports don't reference non-existent project files
-        # (simplified — checks for relative imports to known paths)
-        known_paths = {f.path for f in project.files}
-        # This is a lightweight check; full validation would need a parser
+            prior = checked.get(f.path)
+            if prior is not None and prior[0] == f.content:
+                errors.extend(prior[1])
+            else:
+                errors.extend(_validate_file(f.path, f.content, f.language))
 
         duration = int((time.time() - start) * 1000)
         self._phases.append(
@@ -489,61 +833,32 @@ class Pipeline:
     # ------------------------------------------------------------------
 
     async def _iterate(
-        self, user_request: str, existing_project: Project
+        self, user_request: str, existing_project: Project, include_full: bool = False
     ) -> GenerationResult:
         """Refine an existing project based on user feedback."""
         start = time.time()
 
-        # Build context from existing files
-        file_tree = "\n".join(existing_project.file_tree())
-        file_contents = ""
-        for f in existing_project.files:
-            file_contents += f"\n### FILE: {f.path}\n{f.content}\n### END FILE\n"
-
+        prompt, omitted_paths = _iterate_prompt(user_request, existing_project, include_full)
         request = LLMRequest(
             messages=[
-                LLMMessage(role="system", content=SYSTEM_PROMPT + "\n\n" + REFINER_PROMPT),
-                LLMMessage(
-                    role="user",
-                    content=(
-                        f"Here is the current project:\n\n"
-                        f"File tree:\n{file_tree}\n\n"
-                        f"Files:\n{file_contents}\n\n"
-                        f"Change request: {user_request}\n\n"
-                        f"Output ONLY the files that need to change, using ### FILE: markers. "
-                        f"Each file must be complete (not a diff)."
-                    ),
-                ),
+                LLMMessage(role="system", content=_ITERATE_SYSTEM_PROMPT),
+                LLMMessage(role="user", content=prompt),
             ],
             temperature=0.3,
             max_tokens=16000,
-            model=select_model(Phase.ITERATE, self._gemini_key, self._anthropic_key),
+            model=self._model_for_phase[Phase.ITERATE],
         )
 
         response = await self._llm(request)
         duration = int((time.time() - start) * 1000)
 
         # Parse changed files
-        changed_files = parse_files_from_response(response.content)
-        new_deps_f, new_deps_b = parse_deps_from_response(response.content)
+        changed_files, new_deps_f, new_deps_b = _parse_output(response.content)
+        changed_files = _drop_blind_edits(changed_files, omitted_paths)
 
         # Merge: replace changed files, keep unchanged
-        updated_files = list(existing_project.files)
-        changed_paths = {f.path for f in changed_files}
-
-        # Remove old versions of changed files
-        updated_files = [f for f in updated_files if f.path not in changed_paths]
-        # Add new versions
-        updated_files.extend(changed_files)
-
-        project = existing_project.model_copy(
-            update={
-                "files": updated_files,
-                "version": existing_project.version + 1,
-                "frontend_deps": existing_project.frontend_deps + new_deps_f,
-                "backend_deps": existing_project.backend_deps + new_deps_b,
-            }
-        )
+        project = _merge_project(existing_project, changed_files, new_deps_f, new_deps_b)
+        updated_files = project.files
 
         self._phases.append(
             PhaseResult(
@@ -578,16 +893,9 @@ class Pipeline:
         """Stream the GENERATE phase, yielding tokens and files incrementally."""
         start = time.time()
 
-        system_parts = [SYSTEM_PROMPT]
-        if spec.stack in (Stack.REACT_FASTAPI, Stack.REACT_ONLY):
-            system_parts.append(FRONTEND_PROMPT)
-        if spec.stack in (Stack.REACT_FASTAPI, Stack.FASTAPI_ONLY):
-            system_parts.append(BACKEND_PROMPT)
-        if spec.stack != Stack.REACT_ONLY:
-            system_parts.append(DATABASE_PROMPT)
-        system_prompt = "\n\n---\n\n".join(system_parts)
+        system_prompt = _compose_system_prompt(spec.stack)
 
-        primary_model = select_model(Phase.GENERATE, self._gemini_key, self._anthropic_key)
+        primary_model = self._model_for_phase[Phase.GENERATE]
         fallback_models = []
         if self._anthropic_key:
             fallback_models.append("claude-sonnet-4-6")
@@ -596,61 +904,97 @@ class Pipeline:
         fallback_models = [m for m in fallback_models if m != primary_model]
         models_to_try = [primary_model] + fallback_models
 
+        messages = [
+            LLMMessage(role="system", content=system_prompt),
+            LLMMessage(
+                role="user",
+                content=(
+                    f"Generate a complete application based on this plan.\n\n"
+                    f"User Request: {user_request}\n\n"
+                    f"Technical Plan:\n{plan}\n\n"
+                    f"Generate ALL files using ### FILE: markers. "
+                    f"Follow the generation order specified in the system prompt. "
+                    f"Every file must be complete and runnable."
+                ),
+            ),
+        ]
+
         accumulated = ""
         emitted_paths: set[str] = set()
         used_model = primary_model
+        last_error: Exception | None = None
         total_tokens_in = 0
         total_tokens_out = 0
 
         for model_id in models_to_try:
-            accumulated = ""
             emitted_paths = set()
+            scanner = _FileScanner()
+            self._streamed_checks = {}
 
-            request = LLMRequest(
-                messages=[
-                    LLMMessage(role="system", content=system_prompt),
-                    LLMMessage(
-                        role="user",
-                        content=(
-                            f"Generate a complete application based on this plan.\n\n"
-                            f"User Request: {user_request}\n\n"
-                            f"Technical Plan:\n{plan}\n\n"
-                            f"Generate ALL files using ### FILE: markers. "
-                            f"Follow the generation order specified in the system prompt. "
-                            f"Every file must be complete and runnable."
-                        ),
-                    ),
-                ],
-                temperature=0.3,
-                max_tokens=32000,
-                model=model_id,
+            # Messages are validated once above; skip re-validation per attempt
+            request = LLMRequest.model_construct(
+                messages=messages, temperature=0.3, max_tokens=32000, model=model_id,
             )
 
             recitation = False
-            async for chunk in self._llm_stream(request):
-                if chunk["type"] == "token":
-                    accumulated += chunk["content"]
-                    yield {"event": "token", "data": {"content": chunk["content"]}}
-
-                    # Incremental file extraction — check for completed files
-                    for match in FILE_PATTERN.finditer(accumulated):
-                        path = match.group(1).strip()
-                        if path not in emitted_paths:
-                            from aus.generators.parser import _clean_content, _infer_role, _infer_language
-                            content = _clean_content(match.group(2))
-                            emitted_paths.add(path)
-                            yield {"event": "studio_file", "data": {
-                                "path": path,
-                                "content": content,
-                                "role": _infer_role(path).value,
-                                "language": _infer_language(path),
-                            }}
-
-                elif chunk["type"] == "done":
-                    total_tokens_in = chunk.get("tokens_in", 0)
-                    total_tokens_out = chunk.get("tokens_out", 0)
-                    used_model = chunk.get("model", model_id)
-                    recitation = chunk.get("recitation", False)
+            token_buf: list[str] = []
+            last_flush = time.monotonic()
+            # Once output has reached the client, a fallback model's answer
+            # would be appended to this one's partial text
+            sent = False
+            try:
+                async for kind, payload in _buffered(self._llm_stream(request)):
+                    if kind == TOKEN:
+                        token_buf.append(payload)
+
+                        # Incremental file extraction — check for completed files
+                        matches = scanner.feed(payload)
+                        if (
+                            matches
+                            or len(token_buf) >= TOKEN_FLUSH_COUNT
+                            or time.monotonic() - last_flush > TOKEN_FLUSH_INTERVAL
+                        ):
+                            yield {"event": "token", "data": {"content": "".join(token_buf)}}
+                            sent = True
+                            token_buf.clear()
+                            last_flush = time.monotonic()
+
+                        for match in matches:
+                            path = match.group(1).strip()
+                            if path not in emitted_paths:
+                                content = _clean_content(match.group(2))
+                                language = _infer_language(path)
+                                emitted_paths.add(path)
+                                # Validate while the rest of the output is still streaming
+                                self._streamed_checks[path] = (
+                                    content, _validate_file(path, content, language)
+                                )
+                                yield {"event": "studio_file", "data": {
+                                    "path": path,
+                                    "content": content,
+                                    "role": _infer_role(path).value,
+                                    "language": language,
+                                }}
+
+                    elif kind == DONE:
+                        total_tokens_in = payload.get("tokens_in", 0)
+                        total_tokens_out = payload.get("tokens_out", 0)
+                        used_model = payload.get("model", model_id)
+                        recitation = payload.get("recitation", False)
+            except Exception as e:
+                if not is_transient_error(e) or sent:
+                    raise
+                log.warning(
+                    f"GENERATE stream failed on {model_id} ({type(e).__name__}), "
+                    f"trying fallback..."
+                )
+                last_error = e
+                continue
+            last_error = None
+            accumulated = scanner.text()
+
+            if token_buf:
+                yield {"event": "token", "data": {"content": "".join(token_buf)}}
 
             if recitation or not accumulated.strip():
                 log.warning(f"GENERATE stream empty/recitation from {model_id}, trying fallback...")
@@ -659,19 +1003,23 @@ class Pipeline:
                 log.info(f"GENERATE stream succeeded with {model_id}")
                 break
 
+        if last_error is not None:
+            raise last_error
+
         # Final parse pass — catch any files missed during streaming
-        files = parse_files_from_response(accumulated)
+        files, frontend_deps, backend_deps = await asyncio.to_thread(
+            _parse_output, accumulated
+        )
         for f in files:
             if f.path not in emitted_paths:
                 emitted_paths.add(f.path)
                 yield {"event": "studio_file", "data": {
                     "path": f.path,
                     "content": f.content,
-                    "role": f.role.value if hasattr(f.role, "value") else str(f.role),
+                    "role": f.role.value if isinstance(f.role, Enum) else str(f.role),
                     "language": f.language,
                 }}
 
-        frontend_deps, backend_deps = parse_deps_from_response(accumulated)
         if frontend_deps or backend_deps:
             yield {"event": "studio_deps", "data": {
                 "frontend": {d.name: d.version for d in frontend_deps},
@@ -716,53 +1064,49 @@ class Pipeline:
     # ------------------------------------------------------------------
 
     async def _stream_iterate(
-        self, user_request: str, existing_project: Project
+        self, user_request: str, existing_project: Project, include_full: bool = False
     ) -> AsyncIterator[dict]:
         """Stream the ITERATE phase with token-level output."""
         start = time.time()
 
         yield {"event": "phase", "data": {"phase": "ITERATE", "status": "started"}}
 
-        file_tree = "\n".join(existing_project.file_tree())
-        file_contents = ""
-        for f in existing_project.files:
-            file_contents += f"\n### FILE: {f.path}\n{f.content}\n### END FILE\n"
-
+        prompt, omitted_paths = _iterate_prompt(user_request, existing_project, include_full)
         request = LLMRequest(
             messages=[
-                LLMMessage(role="system", content=SYSTEM_PROMPT + "\n\n" + REFINER_PROMPT),
-                LLMMessage(
-                    role="user",
-                    content=(
-                        f"Here is the current project:\n\n"
-                        f"File tree:\n{file_tree}\n\n"
-                        f"Files:\n{file_contents}\n\n"
-                        f"Change request: {user_request}\n\n"
-                        f"Output ONLY the files that need to change, using ### FILE: markers. "
-                        f"Each file must be complete (not a diff)."
-                    ),
-                ),
+                LLMMessage(role="system", content=_ITERATE_SYSTEM_PROMPT),
+                LLMMessage(role="user", content=prompt),
             ],
             temperature=0.3,
             max_tokens=16000,
-            model=select_model(Phase.ITERATE, self._gemini_key, self._anthropic_key),
+            model=self._model_for_phase[Phase.ITERATE],
         )
 
-        accumulated = ""
         emitted_paths: set[str] = set()
+        scanner = _FileScanner()
         total_tokens_in = 0
         total_tokens_out = 0
         used_model = ""
 
-        async for chunk in self._llm_stream(request):
-            if chunk["type"] == "token":
-                accumulated += chunk["content"]
-                yield {"event": "token", "data": {"content": chunk["content"]}}
-
-                for match in FILE_PATTERN.finditer(accumulated):
+        token_buf: list[str] = []
+        last_flush = time.monotonic()
+        async for kind, payload in _buffered(self._llm_stream(request)):
+            if kind == TOKEN:
+                token_buf.append(payload)
+
+                matches = scanner.feed(payload)
+                if (
+                    matches
+                    or len(token_buf) >= TOKEN_FLUSH_COUNT
+                    or time.monotonic() - last_flush > TOKEN_FLUSH_INTERVAL
+                ):
+                    yield {"event": "token", "data": {"content": "".join(token_buf)}}
+                    token_buf.clear()
+                    last_flush = time.monotonic()
+
+                for match in matches:
                     path = match.group(1).strip()
-                    if path not in emitted_paths:
-                        from aus.generators.parser import _clean_content, _infer_role, _infer_language
+                    if path not in emitted_paths and path not in omitted_paths:
                         content = _clean_content(match.group(2))
                         emitted_paths.add(path)
                         yield {"event": "studio_file", "data": {
@@ -772,42 +1116,36 @@ class Pipeline:
                             "language": _infer_language(path),
                         }}
 
-            elif chunk["type"] == "done":
-                total_tokens_in = chunk.get("tokens_in", 0)
-                total_tokens_out = chunk.get("tokens_out", 0)
-                used_model = chunk.get("model", "")
+            elif kind == DONE:
+                total_tokens_in = payload.get("tokens_in", 0)
+                total_tokens_out = payload.get("tokens_out", 0)
+                used_model = payload.get("model", "")
+
+        if token_buf:
+            yield {"event": "token", "data": {"content": "".join(token_buf)}}
 
         # Final parse — merge changed files into existing project
-        changed_files = parse_files_from_response(accumulated)
+        changed_files, new_deps_f, new_deps_b = await asyncio.to_thread(
+            _parse_output, scanner.text()
+        )
+        changed_files = _drop_blind_edits(changed_files, omitted_paths)
         for f in changed_files:
             if f.path not in emitted_paths:
                 yield {"event": "studio_file", "data": {
                     "path": f.path,
                     "content": f.content,
-                    "role": f.role.value if hasattr(f.role, "value") else str(f.role),
+                    "role": f.role.value if isinstance(f.role, Enum) else str(f.role),
                     "language": f.language,
                 }}
 
-        new_deps_f, new_deps_b = parse_deps_from_response(accumulated)
         if new_deps_f or new_deps_b:
             yield {"event": "studio_deps", "data": {
                 "frontend": {d.name: d.version for d in new_deps_f},
                 "backend": {d.name: d.version for d in new_deps_b},
             }}
 
-        updated_files = list(existing_project.files)
-        changed_paths = {f.path for f in changed_files}
-        updated_files = [f for f in updated_files if f.path not in changed_paths]
-        updated_files.extend(changed_files)
-
-        project = existing_project.model_copy(
-            update={
-                "files": updated_files,
-                "version": existing_project.version + 1,
-                "frontend_deps": existing_project.frontend_deps + new_deps_f,
-                "backend_deps": existing_project.backend_deps + new_deps_b,
-            }
-        )
+        project = _merge_project(existing_project, changed_files, new_deps_f, new_deps_b)
+        updated_files = project.files
         self._last_generated_project = project
 
         duration = int((time.time() - start) * 1000)
@@ -62,3 +62,8 @@ def select_model(phase: Phase, gemini_key: str = "", anthropic_key: str = "") ->
         return "claude-sonnet-4-6"
 
     return "gemini-3-flash-preview"  # Default even without keys (will fail at call time)
+
+
+def build_model_table(gemini_key: str = "", anthropic_key: str = "") -> dict[Phase, str]:
+    """Resolve select_model for every phase once, for a fixed set of keys."""
+    return {phase: select_model(phase, gemini_key, anthropic_key) for phase in Phase}
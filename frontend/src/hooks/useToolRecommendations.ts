@@ -51,6 +51,7 @@ export function useToolRecommendations(
           body: JSON.stringify({
             spec_summary: proj.name,
             file_paths: proj.files.map((f) => f.path).slice(0, 20),
+            file_count: proj.files.length,
             theme: themeId,
             existing_deps: {
               frontend: proj.frontend_deps,
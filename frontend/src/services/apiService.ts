@@ -28,14 +28,14 @@ export async function listStacks(): Promise<{
 }
 
 // ---------------------------------------------------------------------------
-// Generation (non-streaming — original endpoints)
+// Generation (non-streaming — /sync endpoints)
 // ---------------------------------------------------------------------------
 
 export async function createProject(
   request: string,
   spec?: Record<string, unknown>,
 ): Promise<Record<string, unknown>> {
-  const res = await fetch(`${BASE}/create`, {
+  const res = await fetch(`${BASE}/create/sync`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify({ request, spec: spec ?? null }),
@@ -51,7 +51,7 @@ export async function refineProject(
   project: Record<string, unknown>,
   request: string,
 ): Promise<Record<string, unknown>> {
-  const res = await fetch(`${BASE}/refine`, {
+  const res = await fetch(`${BASE}/refine/sync`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify({ project, request }),
@@ -8,16 +8,27 @@ from __future__ import annotations
 
 import os
 import json
+import asyncio
 import logging
 from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import orjson
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from aus import Studio
 from aus.models import Project, Spec, GenerationResult
+from aus.generators.llm import (
+    aclose_clients,
+    create_llm_caller,
+    create_streaming_caller,
+    gemini_client,
+)
+from aus.pipeline.orchestrator import Pipeline
 from server.routers.welcome import router as welcome_router
 from server.routers.studio import router as studio_router
 from server.routers.recommend import router as recommend_router
@@ -41,20 +52,39 @@ GEMINI_KEY = os.environ.get("GEMINI_API_KEY", "")
 ANTHROPIC_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
 
 
+def _on_precache_done(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        log.error(f"TTS precache failed: {task.exception()}")
+        app.state.boot_status = "Ready (voice precache failed)"
+        return
+    app.state.boot_status = "Ready"
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.studio = Studio(gemini_key=GEMINI_KEY, anthropic_key=ANTHROPIC_KEY)
+    app.state.llm_call = create_llm_caller(GEMINI_KEY, ANTHROPIC_KEY)
+    app.state.llm_stream = create_streaming_caller(GEMINI_KEY, ANTHROPIC_KEY)
+    # Build the shared Gemini client up front so the first request doesn't pay for it
+    if GEMINI_KEY:
+        gemini_client(GEMINI_KEY)
     app.state.tts_ready = False
     app.state.boot_status = "Initializing..."
     log.info("Loading TTS service...")
     app.state.boot_status = "Loading voice library..."
     await tts.aload()
+    # Cached lines are generated in the background; the cache endpoint
+    # synthesizes any line that isn't on disk yet on first request.
     app.state.boot_status = "Pre-caching voices..."
-    await tts.aprecache()
+    app.state.precache_task = asyncio.create_task(tts.aprecache())
+    app.state.precache_task.add_done_callback(_on_precache_done)
     app.state.tts_ready = True
-    app.state.boot_status = "Ready"
     log.info("A(Us) Studio server started (TTS ready)")
     yield
+    app.state.precache_task.cancel()
+    await aclose_clients()
 
 
 app = FastAPI(
@@ -62,11 +92,24 @@ app = FastAPI(
     description="Collaborative full-stack app generation. Not AI, Us.",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Explicit origins (comma-separated). A wildcard can't be combined with
+# credentials; the dev server falls through 5173-5175 when ports are busy.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get(
+        "CORS_ORIGINS", "http://localhost:5173,http://localhost:5174,http://localhost:5175"
+    ).split(",")
+    if origin.strip()
+]
+
+# Only middleware, so it's outermost: preflights return before routing
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_origin_regex=None,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -89,6 +132,23 @@ def get_studio() -> Studio:
     return app.state.studio
 
 
+def new_pipeline() -> Pipeline:
+    """A Pipeline for one streamed run (it keeps per-run phase state)."""
+    return Pipeline(
+        app.state.llm_call, GEMINI_KEY, ANTHROPIC_KEY, llm_stream=app.state.llm_stream
+    )
+
+
+async def _ndjson(events: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Encode pipeline events as one JSON object per line."""
+    try:
+        async for event in events:
+            yield orjson.dumps(event) + b"\n"
+    except Exception as e:
+        log.exception("Streamed generation failed")
+        yield orjson.dumps({"event": "error", "data": {"message": str(e)}}) + b"\n"
+
+
 # ---------------------------------------------------------------------------
 # Request/Response schemas
 # ---------------------------------------------------------------------------
@@ -129,8 +189,22 @@ async def health():
     }
 
 
-@app.post("/api/create", response_model=GenerationResult)
+@app.post("/api/create")
 async def create_project(req: CreateRequest):
+    """Generate a new full-stack application, streaming pipeline events as NDJSON."""
+    events = new_pipeline().stream_run(req.request, req.spec)
+    return StreamingResponse(_ndjson(events), media_type="application/x-ndjson")
+
+
+@app.post("/api/refine")
+async def refine_project(req: RefineRequest):
+    """Refine an existing project, streaming pipeline events as NDJSON."""
+    events = new_pipeline().stream_run(req.request, existing_project=req.project)
+    return StreamingResponse(_ndjson(events), media_type="application/x-ndjson")
+
+
+@app.post("/api/create/sync", response_model=GenerationResult)
+async def create_project_sync(req: CreateRequest):
     """Generate a new full-stack application."""
     try:
         result = await get_studio().create(req.request, req.spec)
@@ -140,8 +214,8 @@ async def create_project(req: CreateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/refine", response_model=GenerationResult)
-async def refine_project(req: RefineRequest):
+@app.post("/api/refine/sync", response_model=GenerationResult)
+async def refine_project_sync(req: RefineRequest):
     """Refine an existing project."""
     try:
         result = await get_studio().refine(req.project, req.request)
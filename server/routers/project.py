@@ -7,19 +7,25 @@ POST /api/project/export/zip    — export AusProject as downloadable ZIP
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import logging
+import os
+import tempfile
 
 from fastapi import APIRouter, File, UploadFile, HTTPException
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Any
 
 from server.services.project_importer import import_from_folder, import_from_zip
-from server.services.project_exporter import export_to_zip
+from server.services.project_exporter import export_to_zip_stream
 
 router = APIRouter(prefix="/api/project", tags=["project"])
 log = logging.getLogger("aus.project")
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 
 class FolderImportRequest(BaseModel):
     path: str
@@ -29,7 +35,7 @@ class FolderImportRequest(BaseModel):
 async def import_folder(req: FolderImportRequest):
     """Import a project from a local folder path."""
     try:
-        project = import_from_folder(req.path)
+        project = await asyncio.to_thread(import_from_folder, req.path)
         return project
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -43,28 +49,53 @@ async def import_zip(file: UploadFile = File(...)):
     """Import a project from a ZIP file upload."""
     if not file.filename or not file.filename.endswith(".zip"):
         raise HTTPException(status_code=400, detail="File must be a .zip")
+    # Spool the upload to disk in chunks rather than holding it all in memory,
+    # and unpack off the event loop
+    tmp_path = ""
     try:
-        content = await file.read()
-        project = import_from_zip(content)
+        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
+            tmp_path = tmp.name
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
+        project = await asyncio.to_thread(import_from_zip, tmp_path)
         return project
     except Exception as e:
         log.exception("Import from ZIP failed")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if tmp_path:
+            os.unlink(tmp_path)
 
 
 @router.post("/export/zip")
 async def export_zip(project: dict[str, Any]):
     """Export a project as a downloadable ZIP file."""
-    try:
-        zip_bytes = export_to_zip(project)
-        name = project.get("name", "project")
-        return Response(
-            content=zip_bytes,
-            media_type="application/zip",
-            headers={
-                "Content-Disposition": f'attachment; filename="{name}.zip"',
-            },
+    name = project.get("name", "project")
+    # Once streaming starts the status is already 200, so reject malformed
+    # file entries before any bytes go out
+    files = project.get("files", [])
+    if not isinstance(files, list) or not all(
+        isinstance(f, dict)
+        and isinstance(f.get("path"), str)
+        and isinstance(f.get("content"), str)
+        for f in files
+    ):
+        raise HTTPException(
+            status_code=400, detail="Each file needs a string 'path' and 'content'"
         )
+    # Entries are compressed and sent one at a time (the sync generator runs in
+    # the threadpool), so the whole archive is never held in memory. The first
+    # chunk is pulled here so other export failures still return a 500.
+    chunks = export_to_zip_stream(project)
+    try:
+        first = next(chunks)
     except Exception as e:
         log.exception("Export to ZIP failed")
         raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        itertools.chain((first,), chunks),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.zip"',
+        },
+    )
@@ -1,15 +1,32 @@
-"""Tool recommendation router — Gemini Flash powered."""
+"""Tool recommendation router — Gemini Flash/Pro, routed by project complexity."""
 
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
 import logging
 import os
-from typing import Any
+import re
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable
 
+import orjson
 from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from aus.models import LLMMessage, LLMRequest, LLMResponse
+from aus.generators.llm import (
+    TOKEN,
+    BatchCoalescer,
+    call_gemini,
+    call_many,
+    gemini_embedder,
+    stream_gemini,
+)
+from aus.generators.llm_cache import SemanticCache, response_cache
+from server.services.tool_embeddings import search_tools_semantic
 
 router = APIRouter(prefix="/api/studio", tags=["tools"])
 log = logging.getLogger("aus.server.recommend")
@@ -40,20 +57,93 @@ AVAILABLE_TOOLS = [
     "skill-cicd",
 ]
 
+# Prompts start with a byte-identical prefix (instructions + full tool list)
+# so Gemini's implicit prefix cache can reuse it; every per-request field
+# goes after it, most-variable last.
+_ALL_TOOLS = frozenset(AVAILABLE_TOOLS)
+_TOOLS_JOINED = ", ".join(AVAILABLE_TOOLS)
+_PROMPT_PREFIX = (
+    "You are an expert developer tool recommender.\n"
+    f"Given the project context below, recommend relevant tools from this list: {_TOOLS_JOINED}\n"
+    "Return a JSON array of objects with keys: toolId, reason, priority (1=highest).\n"
+    "Only recommend tools that are genuinely useful for this project.\n"
+    "Return ONLY the JSON array, no markdown fences or extra text.\n\n"
+)
+_BATCH_PROMPT_PREFIX = (
+    "You are an expert developer tool recommender.\n"
+    "For each project below, recommend relevant tools from this list: "
+    f"{_TOOLS_JOINED}\n"
+    "Return a JSON array with one inner array per project, in project order. "
+    "Each inner array holds objects with keys: toolId, reason, priority (1=highest).\n"
+    "Only recommend tools that are genuinely useful for each project.\n"
+    "Return ONLY the JSON array, no markdown fences or extra text.\n\n"
+)
+
+RECOMMEND_MODEL = "gemini-3-flash-preview"
+ESCALATION_MODEL = "gemini-3-pro-preview"
+RECOMMEND_TIMEOUT = 5.0
+# Gemini 3 counts thinking tokens against max_output_tokens, so a tight cap
+# truncates or empties answers. This is the models' output ceiling, i.e. the
+# same as sending no cap at all.
+RECOMMEND_MAX_TOKENS = 65_536
+ESCALATION_TIMEOUT = 15.0
+
+# Complexity score = file count + dependency count / 5 + summary length / 200.
+# The studio sends the real file count (file_paths is capped at 20) and only
+# the project name as the summary, so in practice the score is the file
+# count plus deps: generated projects land around 8-30, big imports above 40.
+# Only near-empty projects are answered from the semantic search alone;
+# large ones go straight to Pro.
+TINY_MAX_SCORE = 1
+LARGE_MIN_SCORE = 40
+TINY_TOP_K = 5
+
+# Exact repeats are answered from the LLM layer's response cache before
+# anything else. Near-duplicate projects (slightly different summary/paths)
+# then reuse a previous answer; only the project's own fields are embedded,
+# since every prompt shares the same long instruction prefix.
+_semantic_cache: SemanticCache | None = None
+
+
+def _get_semantic_cache() -> SemanticCache:
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            gemini_embedder(GEMINI_KEY), threshold=0.95, max_entries=1024
+        )
+    return _semantic_cache
+
+
+# Semantic pre-filter results keyed by sha1 of the normalized summary.
+# The tool set is fixed, so a repeated summary skips the embedding call.
+CANDIDATE_CACHE_SIZE = 512
+CANDIDATE_CACHE_TTL = 3600.0
+_candidate_cache: OrderedDict[str, tuple[float, tuple[str, ...]]] = OrderedDict()
+
 
 async def _get_semantic_candidates(summary: str, top_k: int = 30) -> list[str]:
     """Pre-filter tools using semantic search before LLM ranking."""
+    key = hashlib.sha1(f"{top_k}:{summary.strip().lower()}".encode()).hexdigest()
+    entry = _candidate_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        _candidate_cache.move_to_end(key)
+        return list(entry[1])
     try:
-        from server.services.tool_embeddings import search_tools_semantic
         results = await search_tools_semantic(summary, GEMINI_KEY, top_k=top_k)
-        return [r["id"] for r in results]
     except Exception:
         return list(AVAILABLE_TOOLS)
+    ids = tuple(r["id"] for r in results)
+    _candidate_cache[key] = (time.monotonic() + CANDIDATE_CACHE_TTL, ids)
+    _candidate_cache.move_to_end(key)
+    while len(_candidate_cache) > CANDIDATE_CACHE_SIZE:
+        _candidate_cache.popitem(last=False)
+    return list(ids)
 
 
 class RecommendRequest(BaseModel):
     spec_summary: str
     file_paths: list[str] = []
+    file_count: int | None = None  # total files; file_paths may be a sample
     theme: str = "expert"
     existing_deps: dict[str, dict[str, str]] = {}
 
@@ -68,96 +158,311 @@ class RecommendResponse(BaseModel):
     recommendations: list[ToolRecommendation] = []
 
 
+def _format_deps(deps: dict[str, dict[str, str]]) -> str:
+    """Compact `section: pkg@ver, pkg@ver; ...` form — fewer tokens than JSON."""
+    return "; ".join(
+        f"{section}: " + ", ".join(f"{name}@{version}" for name, version in pkgs.items())
+        for section, pkgs in deps.items()
+    )
+
+
+def _context_lines(req: RecommendRequest, tool_ids: list[str] | None) -> list[str]:
+    lines = []
+    if tool_ids and set(tool_ids) != _ALL_TOOLS:
+        candidates = ", ".join(tool_ids)
+        lines.append(f"Candidate tools (use these instead of the list above): {candidates}")
+    lines.append(f"Theme: {req.theme}")
+    if req.existing_deps:
+        lines.append(f"Existing dependencies: {_format_deps(req.existing_deps)}")
+    if req.file_paths:
+        lines.append(f"File paths: {', '.join(req.file_paths)}")
+    lines.append(f"Project summary: {req.spec_summary}")
+    return lines
+
+
 def _build_prompt(req: RecommendRequest, tool_ids: list[str] | None = None) -> str:
     """Build the recommendation prompt with project context."""
-    tools_list = ", ".join(tool_ids or AVAILABLE_TOOLS)
-    parts = [
-        "You are an expert developer tool recommender.",
-        f"Given the following project context, recommend relevant tools from this list: {tools_list}",
-        "",
-        f"Project summary: {req.spec_summary}",
-    ]
-    if req.file_paths:
-        parts.append(f"File paths: {', '.join(req.file_paths)}")
-    if req.existing_deps:
-        parts.append(f"Existing dependencies: {json.dumps(req.existing_deps)}")
-    parts.append(f"Theme: {req.theme}")
-    parts.append("")
-    parts.append(
-        "Return a JSON array of objects with keys: toolId, reason, priority (1=highest)."
-    )
-    parts.append("Only recommend tools that are genuinely useful for this project.")
-    parts.append("Return ONLY the JSON array, no markdown fences or extra text.")
-    return "\n".join(parts)
+    return _PROMPT_PREFIX + "\n".join(_context_lines(req, tool_ids))
+
+
+def _build_batch_prompt(items: list[tuple[RecommendRequest, list[str]]]) -> str:
+    """One prompt covering several projects, answered as an array of arrays."""
+    parts = [f"There are {len(items)} projects; return exactly {len(items)} arrays.", ""]
+    for i, (req, tool_ids) in enumerate(items):
+        parts.append(f"### Project {i} ###")
+        parts.extend(_context_lines(req, tool_ids))
+        parts.append("")
+    return _BATCH_PROMPT_PREFIX + "\n".join(parts)
+
+
+_REC_KEYS = frozenset({"toolId", "reason", "priority"})
+_REC_LIST_ADAPTER = TypeAdapter(list[ToolRecommendation])
+
+
+def _is_rec_item(item: Any) -> bool:
+    return isinstance(item, dict) and _REC_KEYS <= item.keys()
+
+
+# Optional markdown fence (with optional language tag) around the JSON body;
+# the closing fence may be missing if the output was cut off.
+_FENCE_RE = re.compile(r"^\s*```[\w-]*[^\S\n]*\n?(.*?)\n?(?:```)?\s*$", re.DOTALL)
+
+
+def _strip_fences(text: str) -> str:
+    m = _FENCE_RE.match(text)
+    return (m.group(1) if m else text).strip()
 
 
 def _parse_recommendations(text: str) -> list[ToolRecommendation]:
     """Parse Gemini response text into validated ToolRecommendation list."""
-    # Strip markdown fences if present
-    cleaned = text.strip()
-    if cleaned.startswith("```"):
-        # Remove opening fence (with optional language tag)
-        first_newline = cleaned.index("\n")
-        cleaned = cleaned[first_newline + 1 :]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[: -3]
-    cleaned = cleaned.strip()
-
-    items = json.loads(cleaned)
+    items = orjson.loads(_strip_fences(text))
     if not isinstance(items, list):
         return []
+    return _REC_LIST_ADAPTER.validate_python([item for item in items if _is_rec_item(item)])
 
-    recommendations: list[ToolRecommendation] = []
-    for item in items:
-        if not isinstance(item, dict):
-            continue
-        if "toolId" not in item or "reason" not in item or "priority" not in item:
-            continue
-        recommendations.append(
-            ToolRecommendation(
-                toolId=str(item["toolId"]),
-                reason=str(item["reason"]),
-                priority=int(item["priority"]),
-            )
+
+class _ArrayItemScanner:
+    """Pulls complete top-level objects out of a JSON array as it streams in.
+
+    Tracks brace depth (ignoring braces inside strings) and parses each
+    object as soon as its closing brace arrives. Surrounding fences, the
+    array brackets and commas are skipped.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._start = 0
+        self._in_str = False
+        self._escape = False
+
+    def feed(self, text: str) -> list[Any]:
+        self._buf += text
+        buf = self._buf
+        items = []
+        for i in range(self._pos, len(buf)):
+            c = buf[i]
+            if self._in_str:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_str = False
+            elif c == '"':
+                self._in_str = True
+            elif c == "{":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif c == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        items.append(orjson.loads(buf[self._start : i + 1]))
+                    except orjson.JSONDecodeError:
+                        pass
+        self._pos = len(buf)
+        return items
+
+
+def _recommend_request(prompt: str, model: str = RECOMMEND_MODEL) -> LLMRequest:
+    # temperature 0 keeps the answer deterministic, so it is cacheable
+    return LLMRequest(
+        messages=[LLMMessage(role="user", content=prompt)],
+        model=model,
+        temperature=0.0,
+        max_tokens=RECOMMEND_MAX_TOKENS,
+    )
+
+
+async def _run_batch(items: list[tuple[RecommendRequest, list[str]]]) -> list[LLMResponse]:
+    """Answer several recommend requests with a single Gemini call.
+
+    Falls back to one call per request if the batched answer doesn't have
+    exactly one array per project.
+    """
+    if len(items) > 1:
+        request = LLMRequest(
+            messages=[LLMMessage(role="user", content=_build_batch_prompt(items))],
+            model=RECOMMEND_MODEL,
+            temperature=0.0,
+            max_tokens=RECOMMEND_MAX_TOKENS,
         )
+        raw = await call_gemini(request, GEMINI_KEY)
+        try:
+            slices = orjson.loads(_strip_fences(raw.content))
+        except orjson.JSONDecodeError:
+            slices = None
+        if isinstance(slices, list) and len(slices) == len(items):
+            return [raw.model_copy(update={"content": orjson.dumps(s).decode()}) for s in slices]
+        log.warning(f"Batched recommendation for {len(items)} projects malformed, retrying singly")
+
+    requests = [_recommend_request(_build_prompt(req, ids)) for req, ids in items]
+    return await call_many(requests, lambda r: call_gemini(r, GEMINI_KEY))
+
+
+# Concurrent previews within a 15ms window share one Gemini call
+_coalescer = BatchCoalescer(_run_batch, max_batch=8, wait_ms=15)
+
+
+def _sse(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+def _complexity(req: RecommendRequest) -> str:
+    files = req.file_count if req.file_count is not None else len(req.file_paths)
+    deps = sum(len(pkgs) for pkgs in req.existing_deps.values())
+    score = files + deps // 5 + len(req.spec_summary) // 200
+    if score <= TINY_MAX_SCORE:
+        return "tiny"
+    if score >= LARGE_MIN_SCORE:
+        return "large"
+    return "small"
+
+
+def _nearest_tools(candidates: list[str]) -> list[ToolRecommendation]:
+    return [
+        ToolRecommendation(
+            toolId=tool_id,
+            reason="Closest semantic match to the project summary",
+            priority=i + 1,
+        )
+        for i, tool_id in enumerate(candidates[:TINY_TOP_K])
+    ]
+
+
+def _cache_text(req: RecommendRequest) -> str:
+    """The project-specific part of a prompt, for semantic cache lookups."""
+    lines = [req.spec_summary, req.theme]
+    if req.file_paths:
+        lines.append(", ".join(req.file_paths))
+    if req.existing_deps:
+        lines.append(_format_deps(req.existing_deps))
+    return "\n".join(lines)
+
+
+def _usable(response: LLMResponse) -> list[ToolRecommendation]:
+    """Parsed recommendations, or [] if the answer is empty or malformed."""
+    if not response.content.strip():
+        return []
+    try:
+        return _parse_recommendations(response.content)
+    except Exception as e:
+        log.debug(f"Unparseable recommendation response: {e}")
+        return []
+
+
+async def _ask(
+    req: RecommendRequest,
+    request: LLMRequest,
+    call: Callable[[LLMRequest], Awaitable[LLMResponse]],
+    timeout: float,
+) -> list[ToolRecommendation]:
+    """One routed attempt; an empty list means the caller should escalate.
+
+    Only answers that parse into a non-empty list are cached, so a malformed
+    answer is retried next time rather than replayed for the whole TTL.
+    """
+    key = response_cache.key_for(request, request.model)
+    try:
+        raw = await response_cache.get(key) if key else None
+        hit = raw is not None
+        if not hit:
+            raw = await asyncio.wait_for(
+                _get_semantic_cache().get_or_call(
+                    request, call, text=_cache_text(req), accept=lambda r: bool(_usable(r))
+                ),
+                timeout=timeout,
+            )
+    except asyncio.TimeoutError:
+        log.warning(f"{request.model} recommendation timed out ({timeout:g}s)")
+        return []
+    except Exception:
+        log.exception(f"{request.model} recommendation failed")
+        return []
+
+    recommendations = _usable(raw)
+    if not recommendations:
+        log.warning(f"Empty or malformed recommendation response from {request.model}")
+    if key:
+        # call_gemini caches whatever it got back, so drop a rejected answer;
+        # batched answers bypass that cache and are stored here
+        if not recommendations:
+            await response_cache.delete(key)
+        elif not hit:
+            await response_cache.set(key, raw)
     return recommendations
 
 
 @router.post("/recommend", response_model=RecommendResponse)
 async def recommend_tools(req: RecommendRequest) -> RecommendResponse:
-    """Recommend tools for a project using Gemini Flash."""
+    """Recommend tools for a project, routed by project complexity.
+
+    Tiny projects use the semantic pre-filter alone, small ones ask Flash
+    and escalate to Pro if that yields nothing, large ones ask Pro.
+    """
     if not GEMINI_KEY:
         log.warning("GEMINI_API_KEY not set, returning empty recommendations")
         return RecommendResponse()
 
+    complexity = _complexity(req)
     candidates = await _get_semantic_candidates(req.spec_summary)
-    prompt = _build_prompt(req, candidates)
+    # The fallback list means search failed, so there's no ranking to reuse
+    if complexity == "tiny" and candidates and candidates != AVAILABLE_TOOLS:
+        return RecommendResponse(recommendations=_nearest_tools(candidates))
 
-    try:
-        # Lazy import — heavy SDK
-        from google import genai
+    prompt = _build_prompt(req, candidates)
+    recommendations: list[ToolRecommendation] = []
+    if complexity != "large":
+        recommendations = await _ask(
+            req,
+            _recommend_request(prompt),
+            lambda r: _coalescer.submit((req, candidates)),
+            RECOMMEND_TIMEOUT,
+        )
+    if not recommendations:
+        recommendations = await _ask(
+            req,
+            _recommend_request(prompt, ESCALATION_MODEL),
+            lambda r: call_gemini(r, GEMINI_KEY),
+            ESCALATION_TIMEOUT,
+        )
+    return RecommendResponse(recommendations=recommendations)
 
-        client = genai.Client(api_key=GEMINI_KEY)
 
-        raw = await asyncio.wait_for(
-            client.aio.models.generate_content(
-                model="gemini-3-flash-preview",
-                contents=prompt,
-            ),
-            timeout=5.0,
-        )
+async def _recommend_events(req: RecommendRequest) -> AsyncIterator[bytes]:
+    count = 0
+    if GEMINI_KEY:
+        candidates = await _get_semantic_candidates(req.spec_summary)
+        request = _recommend_request(_build_prompt(req, candidates))
+        scanner = _ArrayItemScanner()
+        try:
+            async for kind, payload in stream_gemini(request, GEMINI_KEY):
+                if kind != TOKEN:
+                    continue
+                for item in scanner.feed(payload):
+                    if not _is_rec_item(item):
+                        continue
+                    try:
+                        rec = ToolRecommendation.model_validate(item)
+                    except ValidationError:
+                        continue
+                    count += 1
+                    yield _sse("recommendation", rec.model_dump())
+        except Exception:
+            log.exception("Recommendation stream failed")
+    else:
+        log.warning("GEMINI_API_KEY not set, returning empty recommendations")
+    yield _sse("done", {"count": count})
 
-        text = raw.text or ""
-        if not text.strip():
-            log.warning("Empty response from Gemini Flash")
-            return RecommendResponse()
 
-        recommendations = _parse_recommendations(text)
-        return RecommendResponse(recommendations=recommendations)
+@router.post("/recommend/stream")
+async def recommend_tools_stream(req: RecommendRequest) -> StreamingResponse:
+    """Stream recommendations as SSE, one `recommendation` event per tool.
 
-    except asyncio.TimeoutError:
-        log.warning("Gemini Flash recommendation timed out (3s)")
-        return RecommendResponse()
-    except Exception:
-        log.exception("Recommendation failed")
-        return RecommendResponse()
+    Each recommendation is sent as soon as its JSON object is complete in
+    the model output; a final `done` event carries the count.
+    """
+    return StreamingResponse(_recommend_events(req), media_type="text/event-stream")
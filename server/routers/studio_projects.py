@@ -7,7 +7,8 @@ from __future__ import annotations
 
 import logging
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 
 from server.services.studio_persistence import (
     create_project,
@@ -34,6 +35,8 @@ class CreateProjectBody(BaseModel):
 
 
 class UpdateProjectBody(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     name: str | None = None
     description: str | None = None
     stack: str | None = None
@@ -69,12 +72,13 @@ def api_get_project(project_id: str):
     p = get_project(project_id)
     if not p:
         raise HTTPException(404, "Project not found")
-    return p
+    # Plain JSON from SQLite; skip jsonable_encoder's walk over every file
+    return ORJSONResponse(p)
 
 
 @router.put("/{project_id}")
 def api_update_project(project_id: str, body: UpdateProjectBody):
-    data = {k: v for k, v in body.model_dump().items() if v is not None}
+    data = body.model_dump(exclude_none=True)
     if not update_project(project_id, data):
         raise HTTPException(404, "Project not found")
     return get_project(project_id)
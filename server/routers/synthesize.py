@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
+import time
 
+import orjson
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from aus.generators.llm import BatchCoalescer, claude_client, gemini_client
+
 router = APIRouter(prefix="/api/studio", tags=["interview"])
 log = logging.getLogger("aus.server.synthesize")
 
@@ -44,6 +47,17 @@ to a code generation system that produces React + FastAPI applications.
 Return your response as JSON with keys: prd, design_brief, summary, generation_prompt
 Return ONLY the JSON object, no markdown fences."""
 
+BATCH_INSTRUCTIONS = """There are {n} separate interviews below, each under its own
+### Interview i ### heading. Treat each one independently.
+Return a JSON array of exactly {n} objects, one per interview in order, each with
+keys: prd, design_brief, summary, generation_prompt.
+Return ONLY the JSON array, no markdown fences."""
+
+SYNTHESIS_TIMEOUT = 30.0
+# A batched call may use this much of SYNTHESIS_TIMEOUT; whatever is left is
+# the budget for the per-interview fallback, so the overall bound is unchanged
+BATCH_SYNTHESIS_TIMEOUT = SYNTHESIS_TIMEOUT / 2
+
 
 def _build_synthesis_prompt(domain: str, answers: dict[str, str]) -> str:
     formatted = []
@@ -59,23 +73,27 @@ Interview Answers:
 Generate the PRD, Design Brief, Summary, and Generation Prompt as JSON."""
 
 
-def _parse_synthesis(text: str) -> dict:
+def _strip_fences(text: str) -> str:
     cleaned = text.strip()
     if cleaned.startswith("```"):
         first_nl = cleaned.index("\n")
         cleaned = cleaned[first_nl + 1:]
     if cleaned.endswith("```"):
         cleaned = cleaned[:-3]
-    cleaned = cleaned.strip()
+    return cleaned.strip()
+
+
+def _parse_synthesis(text: str) -> dict:
+    cleaned = _strip_fences(text)
     try:
-        data = json.loads(cleaned)
+        data = orjson.loads(cleaned)
         return {
             "prd": str(data.get("prd", "")),
             "design_brief": str(data.get("design_brief", "")),
             "summary": str(data.get("summary", "")),
             "generation_prompt": str(data.get("generation_prompt", "")),
         }
-    except (json.JSONDecodeError, AttributeError):
+    except (orjson.JSONDecodeError, AttributeError):
         log.warning("Failed to parse synthesis JSON, using raw text as prompt")
         return {
             "prd": "",
@@ -85,26 +103,64 @@ def _parse_synthesis(text: str) -> dict:
         }
 
 
-async def _synthesize_gemini(prompt: str) -> str:
-    from google import genai
-
-    client = genai.Client(api_key=GEMINI_KEY)
+async def _generate_gemini(text: str, timeout: float) -> str:
+    client = gemini_client(GEMINI_KEY)
     response = await asyncio.wait_for(
         client.aio.models.generate_content(
             model="gemini-3-flash-preview",
-            contents=[
-                {"role": "user", "parts": [{"text": SYNTHESIS_SYSTEM + "\n\n" + prompt}]}
-            ],
+            contents=[{"role": "user", "parts": [{"text": text}]}],
         ),
-        timeout=30.0,
+        timeout=timeout,
     )
     return response.text or ""
 
 
-async def _synthesize_claude(prompt: str) -> str:
-    import anthropic
+async def _synthesize_gemini_batch(prompts: list[str]) -> list[str | BaseException]:
+    """Synthesize several interviews in one Gemini call.
+
+    Each result is the JSON text for one interview, so _parse_synthesis
+    treats it exactly like a single-call response. Falls back to one call
+    per interview if the batched call fails for any reason or its answer
+    isn't an array of the right length; the whole thing stays within SYNTHESIS_TIMEOUT.
+    """
+    deadline = time.monotonic() + SYNTHESIS_TIMEOUT
+    if len(prompts) > 1:
+        parts = [SYNTHESIS_SYSTEM, "", BATCH_INSTRUCTIONS.format(n=len(prompts)), ""]
+        for i, prompt in enumerate(prompts):
+            parts.append(f"### Interview {i} ###")
+            parts.append(prompt)
+            parts.append("")
+        try:
+            raw = await _generate_gemini("\n".join(parts), BATCH_SYNTHESIS_TIMEOUT)
+            items = orjson.loads(_strip_fences(raw))
+        except Exception as e:
+            log.warning(f"Batched synthesis failed ({type(e).__name__}: {e})")
+            items = None
+        if isinstance(items, list) and len(items) == len(prompts):
+            return [orjson.dumps(item).decode() for item in items]
+        log.warning(
+            f"Batched synthesis of {len(prompts)} interviews failed or malformed, "
+            f"retrying singly"
+        )
+    # One interview timing out shouldn't fail the others in the batch
+    remaining = max(deadline - time.monotonic(), 0.0)
+    return list(await asyncio.gather(
+        *(_generate_gemini(SYNTHESIS_SYSTEM + "\n\n" + p, remaining) for p in prompts),
+        return_exceptions=True,
+    ))
+
+
+# Interviews finishing within 50ms of each other share one Gemini call
+_gemini_coalescer = BatchCoalescer(_synthesize_gemini_batch, max_batch=4, wait_ms=50)
+
 
-    client = anthropic.AsyncAnthropic(api_key=ANTHROPIC_KEY)
+async def _synthesize_gemini(prompt: str) -> str:
+    return await _gemini_coalescer.submit(prompt)
+
+
+async def _synthesize_claude(prompt: str) -> str:
+    # Keep the SDK's default retries; the shared client disables them
+    client = claude_client(ANTHROPIC_KEY).with_options(max_retries=2)
     response = await asyncio.wait_for(
         client.messages.create(
             model="claude-haiku-4-5-20251001",
@@ -112,7 +168,7 @@ async def _synthesize_claude(prompt: str) -> str:
             system=SYNTHESIS_SYSTEM,
             messages=[{"role": "user", "content": prompt}],
         ),
-        timeout=30.0,
+        timeout=SYNTHESIS_TIMEOUT,
     )
     return response.content[0].text if response.content else ""
 
@@ -133,10 +189,10 @@ async def synthesize_interview(req: SynthesizeRequest) -> SynthesizeResponse:
                 summary="I couldn't synthesize — no API keys configured.",
                 generation_prompt=prompt,
             )
-        parsed = _parse_synthesis(raw)
-        return SynthesizeResponse(**parsed)
+        # _parse_synthesis already str()-casts every field, so skip validation
+        return SynthesizeResponse.model_construct(**_parse_synthesis(raw))
     except asyncio.TimeoutError:
-        log.warning("Synthesis timed out (30s)")
+        log.warning(f"Synthesis timed out ({SYNTHESIS_TIMEOUT:g}s)")
         return SynthesizeResponse(
             summary="Synthesis timed out. Using your answers directly.",
             generation_prompt=prompt,
@@ -8,12 +8,16 @@ GET  /api/blueprints/{id}        — get blueprint files
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import mmap
+import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 
 router = APIRouter(tags=["templates"])
 log = logging.getLogger("aus.templates")
@@ -22,29 +26,98 @@ TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 BLUEPRINTS_DIR = Path(__file__).parent.parent / "blueprints"
 
 
-def _load_json(path: Path) -> dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+# Template files rarely change, so parsed JSON is reused until the file's
+# mtime moves. List caches are keyed by the (name, mtime) of every file, so
+# adding, removing or editing one rebuilds the summary. Everything here is
+# plain JSON already, so endpoints return ORJSONResponse directly and skip
+# jsonable_encoder.
+_FILE_CACHE: dict[Path, tuple[int, dict[str, Any]]] = {}
+_LIST_CACHE: dict[Path, tuple[tuple[tuple[str, int], ...], list[dict[str, Any]]]] = {}
+
+
+# Above this size the file is mapped rather than read into a bytes copy
+MMAP_MIN_BYTES = 1 << 20
+
+
+def _parse_file(path: Path) -> dict[str, Any]:
+    # orjson parses UTF-8 bytes directly, with no intermediate str
+    if path.stat().st_size < MMAP_MIN_BYTES:
+        return orjson.loads(path.read_bytes())
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def _load_json(path: Path, mtime: int | None = None) -> dict[str, Any]:
+    if mtime is None:
+        mtime = path.stat().st_mtime_ns
+    cached = _FILE_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    data = _parse_file(path)
+    _FILE_CACHE[path] = (mtime, data)
+    return data
+
+
+async def _list_dir(
+    directory: Path, kind: str, summarize: Callable[[Path, dict[str, Any]], dict[str, Any]]
+) -> list[dict[str, Any]]:
+    if not directory.exists():
+        return []
+    # One directory read; DirEntry carries the name and type without extra stats
+    with os.scandir(directory) as it:
+        entries = sorted(
+            (e for e in it if e.name.endswith(".json") and e.is_file()), key=lambda e: e.name
+        )
+    mtimes = [e.stat().st_mtime_ns for e in entries]
+    signature = tuple(zip((e.name for e in entries), mtimes))
+    cached = _LIST_CACHE.get(directory)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    files = [Path(e.path) for e in entries]
+    # Read and parse off the event loop, all files at once
+    loaded = await asyncio.gather(
+        *(asyncio.to_thread(_load_json, f, m) for f, m in zip(files, mtimes)),
+        return_exceptions=True,
+    )
+    items = []
+    for f, data in zip(files, loaded):
+        try:
+            if isinstance(data, Exception):
+                raise data
+            items.append(summarize(f, data))
+        except Exception:
+            log.warning("Failed to load %s: %s", kind, f)
+    _LIST_CACHE[directory] = (signature, items)
+    return items
+
+
+def _template_summary(f: Path, data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": f.stem,
+        "name": data.get("name", f.stem),
+        "description": data.get("description", ""),
+        "category": data.get("category", "general"),
+        "stack": data.get("stack", "react-only"),
+        "file_count": len(data.get("files", [])),
+    }
+
+
+def _blueprint_summary(f: Path, data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": f.stem,
+        "name": data.get("name", f.stem),
+        "description": data.get("description", ""),
+        "category": data.get("category", "component"),
+        "file_count": len(data.get("files", [])),
+    }
 
 
 @router.get("/api/templates")
 async def list_templates():
     """List all available project templates."""
-    templates = []
-    if TEMPLATES_DIR.exists():
-        for f in sorted(TEMPLATES_DIR.glob("*.json")):
-            try:
-                data = _load_json(f)
-                templates.append({
-                    "id": f.stem,
-                    "name": data.get("name", f.stem),
-                    "description": data.get("description", ""),
-                    "category": data.get("category", "general"),
-                    "stack": data.get("stack", "react-only"),
-                    "file_count": len(data.get("files", [])),
-                })
-            except Exception:
-                log.warning("Failed to load template: %s", f)
-    return {"templates": templates}
+    templates = await _list_dir(TEMPLATES_DIR, "template", _template_summary)
+    return ORJSONResponse({"templates": templates})
 
 
 @router.get("/api/templates/{template_id}")
@@ -54,7 +127,7 @@ async def get_template(template_id: str):
     if not path.exists():
         raise HTTPException(status_code=404, detail=f"Template '{template_id}' not found")
     try:
-        return _load_json(path)
+        return ORJSONResponse(await asyncio.to_thread(_load_json, path))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -62,21 +135,8 @@ async def get_template(template_id: str):
 @router.get("/api/blueprints")
 async def list_blueprints():
     """List all available component blueprints."""
-    blueprints = []
-    if BLUEPRINTS_DIR.exists():
-        for f in sorted(BLUEPRINTS_DIR.glob("*.json")):
-            try:
-                data = _load_json(f)
-                blueprints.append({
-                    "id": f.stem,
-                    "name": data.get("name", f.stem),
-                    "description": data.get("description", ""),
-                    "category": data.get("category", "component"),
-                    "file_count": len(data.get("files", [])),
-                })
-            except Exception:
-                log.warning("Failed to load blueprint: %s", f)
-    return {"blueprints": blueprints}
+    blueprints = await _list_dir(BLUEPRINTS_DIR, "blueprint", _blueprint_summary)
+    return ORJSONResponse({"blueprints": blueprints})
 
 
 @router.get("/api/blueprints/{blueprint_id}")
@@ -86,6 +146,6 @@ async def get_blueprint(blueprint_id: str):
     if not path.exists():
         raise HTTPException(status_code=404, detail=f"Blueprint '{blueprint_id}' not found")
     try:
-        return _load_json(path)
+        return ORJSONResponse(await asyncio.to_thread(_load_json, path))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,18 +2,38 @@
 
 from __future__ import annotations
 
-import io
 import logging
-import wave
+import struct
 
 from fastapi import APIRouter
 from fastapi.responses import Response
 from pydantic import BaseModel
 
+from server.services.gemini_tts import (
+    GEMINI_KEY,
+    THEME_VOICES,
+    VOICES,
+    genai_types,
+    speak,
+    speak_for_theme,
+)
+from server.services.tts_service import tts
+
 router = APIRouter(prefix="/api/tts", tags=["tts"])
 log = logging.getLogger("aus.server.tts")
 
 
+def _wav_header(data_len: int, rate: int = 24000, channels: int = 1, bits: int = 16) -> bytes:
+    """44-byte RIFF/WAVE header for `data_len` bytes of PCM."""
+    block_align = channels * bits // 8
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_len, b"WAVE",
+        b"fmt ", 16, 1, channels, rate, rate * block_align, block_align, bits,
+        b"data", data_len,
+    )
+
+
 class TTSRequest(BaseModel):
     text: str
     voice: str = "Kore"
@@ -26,8 +46,7 @@ class TTSRequest(BaseModel):
 async def tts_speak(req: TTSRequest) -> Response:
     """Generate speech audio. Returns WAV bytes."""
     if req.engine == "gemini":
-        from server.services.gemini_tts import speak, speak_for_theme, GEMINI_KEY
-        if not GEMINI_KEY:
+        if not GEMINI_KEY or genai_types is None:
             return Response(content=b"", status_code=503)
         try:
             if req.theme:
@@ -38,19 +57,11 @@ async def tts_speak(req: TTSRequest) -> Response:
             log.exception("Gemini TTS failed")
             return Response(content=str(e).encode(), status_code=500)
 
-        # Convert PCM to WAV
-        buf = io.BytesIO()
-        with wave.open(buf, "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(24000)
-            wf.writeframes(pcm)
-
-        return Response(content=buf.getvalue(), media_type="audio/wav")
+        # Gemini returns 24kHz 16-bit mono PCM; prepend a WAV header
+        return Response(content=_wav_header(len(pcm)) + pcm, media_type="audio/wav")
     else:
         # Kokoro fallback
         try:
-            from server.services.tts_service import tts
             wav_bytes = await tts.aspeak_to_wav_bytes(req.text, req.voice)
             return Response(content=wav_bytes, media_type="audio/wav")
         except Exception as e:
@@ -58,11 +69,13 @@ async def tts_speak(req: TTSRequest) -> Response:
             return Response(content=str(e).encode(), status_code=500)
 
 
+_VOICES_RESPONSE = {
+    "voices": [{"name": name, "style": style} for name, style in VOICES.items()],
+    "theme_mapping": THEME_VOICES,
+}
+
+
 @router.get("/voices")
 async def list_voices():
     """List all available Gemini TTS voices."""
-    from server.services.gemini_tts import VOICES, THEME_VOICES
-    return {
-        "voices": [{"name": name, "style": style} for name, style in VOICES.items()],
-        "theme_mapping": THEME_VOICES,
-    }
+    return _VOICES_RESPONSE
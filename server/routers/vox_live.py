@@ -22,10 +22,12 @@ Server -> Client JSON:
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import uuid
 
+import orjson
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from server.services.vox_session import VoxLiveSession
@@ -34,6 +36,15 @@ from server.services.vox_tools import VoxToolDispatcher
 router = APIRouter(tags=["vox-live"])
 log = logging.getLogger("aus.vox.live")
 
+# Outbound audio chunks buffered per connection before the oldest is dropped
+AUDIO_QUEUE_SIZE = 16
+
+# Transcript frames are the hottest path; for the two known roles only the
+# text needs encoding per frame.
+_TRANSCRIPT_PREFIXES = {
+    role: f'{{"type":"transcript","role":"{role}","text":' for role in ("user", "vox")
+}
+
 
 @router.websocket("/api/vox/live")
 async def vox_live_ws(ws: WebSocket):
@@ -45,19 +56,35 @@ async def vox_live_ws(ws: WebSocket):
     session: VoxLiveSession | None = None
     muted = False
 
+    # Audio goes out through a bounded queue so a slow browser never stalls
+    # the Gemini receive loop; when it's full the oldest chunk is dropped.
+    audio_out: asyncio.Queue[bytes] = asyncio.Queue(maxsize=AUDIO_QUEUE_SIZE)
+
+    async def drain_audio() -> None:
+        while True:
+            data = await audio_out.get()
+            try:
+                await ws.send_bytes(data)
+            except Exception:
+                pass
+
+    audio_task = asyncio.create_task(drain_audio())
+
     async def on_audio(data: bytes) -> None:
         """Relay Gemini audio back to the browser."""
-        try:
-            await ws.send_bytes(data)
-        except Exception:
-            pass
+        if audio_out.full():
+            audio_out.get_nowait()
+        audio_out.put_nowait(data)
 
     async def on_transcript(role: str, text: str) -> None:
         """Send transcript updates to the browser."""
         try:
-            await ws.send_text(json.dumps({
-                "type": "transcript", "role": role, "text": text,
-            }))
+            prefix = _TRANSCRIPT_PREFIXES.get(role)
+            if prefix is None:
+                frame = orjson.dumps({"type": "transcript", "role": role, "text": text}).decode()
+            else:
+                frame = prefix + orjson.dumps(text).decode() + "}"
+            await ws.send_text(frame)
         except Exception:
             pass
 
@@ -68,7 +95,7 @@ async def vox_live_ws(ws: WebSocket):
     async def on_control(msg: dict) -> None:
         """Forward control messages to the browser."""
         try:
-            await ws.send_text(json.dumps(msg))
+            await ws.send_text(orjson.dumps(msg).decode())
         except Exception:
             pass
 
@@ -91,11 +118,12 @@ async def vox_live_ws(ws: WebSocket):
                 if session and session.connected and not muted:
                     await session.send_audio(message["bytes"])
 
-            # Text frame = JSON control message
+            # Text frame = JSON control message (binary frames are audio, so
+            # outgoing JSON stays in text frames too)
             elif "text" in message and message["text"]:
                 try:
-                    data = json.loads(message["text"])
-                except json.JSONDecodeError:
+                    data = orjson.loads(message["text"])
+                except orjson.JSONDecodeError:
                     continue
 
                 msg_type = data.get("type", "")
@@ -111,9 +139,9 @@ async def vox_live_ws(ws: WebSocket):
                         on_control=on_control,
                     )
                     await session.connect(resume_handle=resume_handle)
-                    await ws.send_text(json.dumps({
+                    await ws.send_text(orjson.dumps({
                         "type": "ready", "sessionId": session_id,
-                    }))
+                    }).decode())
 
                 elif msg_type == "text" and session:
                     text = data.get("content", "")
@@ -126,9 +154,9 @@ async def vox_live_ws(ws: WebSocket):
                 elif msg_type == "end":
                     if session:
                         await session.disconnect()
-                    await ws.send_text(json.dumps({
+                    await ws.send_text(orjson.dumps({
                         "type": "session_end", "reason": "user",
-                    }))
+                    }).decode())
                     break
 
     except WebSocketDisconnect:
@@ -136,6 +164,7 @@ async def vox_live_ws(ws: WebSocket):
     except Exception:
         log.exception("[%s] VOX Live WebSocket error", session_id)
     finally:
+        audio_task.cancel()
         if session:
             await session.disconnect()
         log.info("[%s] VOX Live session cleaned up", session_id)
@@ -35,7 +35,7 @@ MOOD_OPTIONS = [
 ]
 
 
-def match_theme(style: str, density: str, mood: str) -> str:
+def _match_theme_rules(style: str, density: str, mood: str) -> str:
     if style == "technical":
         if density == "compact":
             return "expert"
@@ -63,6 +63,22 @@ def match_theme(style: str, density: str, mood: str) -> str:
     return "casual"
 
 
+# Every offered (style, density, mood) answer resolved once at import
+_THEME_MAP = {
+    (style["value"], density["value"], mood["value"]): _match_theme_rules(
+        style["value"], density["value"], mood["value"]
+    )
+    for style in STYLE_OPTIONS
+    for density in DENSITY_OPTIONS
+    for mood in MOOD_OPTIONS
+}
+
+
+def match_theme(style: str, density: str, mood: str) -> str:
+    theme = _THEME_MAP.get((style, density, mood))
+    return theme if theme is not None else _match_theme_rules(style, density, mood)
+
+
 class ProfileRequest(BaseModel):
     style: str
     density: str = "balanced"
@@ -80,14 +96,18 @@ async def welcome_status():
     return {"firstVisit": True, "profile": None}
 
 
+# Constant, so built once at import rather than per request
+_QUESTIONS_RESPONSE = {
+    "questions": [
+        {"id": "style", "question": "How do you like to work?", "options": STYLE_OPTIONS},
+        {"id": "mood", "question": "What mood suits you best?", "options": MOOD_OPTIONS},
+    ]
+}
+
+
 @router.get("/api/welcome/questions")
 async def welcome_questions():
-    return {
-        "questions": [
-            {"id": "style", "question": "How do you like to work?", "options": STYLE_OPTIONS},
-            {"id": "mood", "question": "What mood suits you best?", "options": MOOD_OPTIONS},
-        ]
-    }
+    return _QUESTIONS_RESPONSE
 
 
 @router.post("/api/welcome/profile")
@@ -100,7 +120,7 @@ async def welcome_profile(req: ProfileRequest):
 @router.get("/api/tts/cache/{filename}")
 async def tts_cache(filename: str):
     name = filename.replace(".wav", "")
-    path = tts.get_cached_path(name)
+    path = await tts.aensure_cached(name)
     if not path:
         raise HTTPException(status_code=404, detail=f"Cached audio not found: {name}")
     return FileResponse(path, media_type="audio/wav")
@@ -9,9 +9,14 @@ import asyncio
 import json
 import os
 
+import orjson
+
+from server.services.tool_embeddings import quantize
+
 CATALOG_PATH = os.path.join(os.path.dirname(__file__), "..", "tool_catalog.json")
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), "..", "tool_embeddings.json")
-BATCH_SIZE = 20
+BATCH_SIZE = 100  # embed_content's per-request maximum
+MAX_CONCURRENCY = 8
 
 
 async def main() -> None:
@@ -30,34 +35,42 @@ async def main() -> None:
 
     print(f"Embedding {len(catalog)} tools...")
 
-    results: list[dict] = []
-    for i in range(0, len(catalog), BATCH_SIZE):
-        batch = catalog[i:i + BATCH_SIZE]
-        texts = [f"{t['name']}: {t['description']}" for t in batch]
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    done = 0
 
-        response = await client.aio.models.embed_content(
-            model="gemini-embedding-001",
-            contents=texts,
-            config=types.EmbedContentConfig(
-                task_type="RETRIEVAL_DOCUMENT",
-                output_dimensionality=768,
-            ),
-        )
-
-        for tool, emb in zip(batch, response.embeddings):
-            results.append({
+    async def embed_batch(batch: list[dict]) -> list[dict]:
+        nonlocal done
+        texts = [f"{t['name']}: {t['description']}" for t in batch]
+        async with sem:
+            response = await client.aio.models.embed_content(
+                model="gemini-embedding-001",
+                contents=texts,
+                config=types.EmbedContentConfig(
+                    task_type="RETRIEVAL_DOCUMENT",
+                    output_dimensionality=768,
+                ),
+            )
+        done += len(batch)
+        print(f"  {done}/{len(catalog)} tools embedded")
+        return [
+            {
                 "id": tool["id"],
                 "name": tool["name"],
                 "description": tool["description"],
                 "domains": tool.get("domains", []),
                 "category": tool.get("category", "library"),
-                "embedding": [round(v, 6) for v in emb.values],
-            })
-
-        print(f"  {min(i + BATCH_SIZE, len(catalog))}/{len(catalog)} tools embedded")
-
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(results, f)
+                **quantize(emb.values),
+            }
+            for tool, emb in zip(batch, response.embeddings)
+        ]
+
+    # Batches are independent requests, so run several at once; gather keeps order
+    batches = [catalog[i:i + BATCH_SIZE] for i in range(0, len(catalog), BATCH_SIZE)]
+    embedded = await asyncio.gather(*(embed_batch(b) for b in batches))
+    results = [item for batch in embedded for item in batch]
+
+    with open(OUTPUT_PATH, "wb") as f:
+        f.write(orjson.dumps(results))
 
     size_mb = os.path.getsize(OUTPUT_PATH) / (1024 * 1024)
     print(f"Saved {len(results)} embeddings to {OUTPUT_PATH} ({size_mb:.1f} MB)")
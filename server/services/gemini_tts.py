@@ -10,6 +10,14 @@ from __future__ import annotations
 import logging
 import os
 
+# The SDK is optional; resolve it once here rather than per call
+try:
+    from google.genai import types as genai_types
+except ImportError:
+    genai_types = None
+
+from aus.generators.llm import gemini_client
+
 log = logging.getLogger("aus.gemini_tts")
 
 TTS_MODEL = "gemini-2.5-flash-preview-tts"
@@ -51,10 +59,10 @@ async def speak(
 
     Returns raw PCM audio bytes (24kHz, 16-bit, mono).
     """
-    from google import genai
-    from google.genai import types
-
-    client = genai.Client(api_key=GEMINI_KEY)
+    if genai_types is None:
+        raise RuntimeError("google-genai is not installed (pip install google-genai)")
+    types = genai_types
+    client = gemini_client(GEMINI_KEY)
 
     if style:
         prompt = f"{style}:\n\"{text}\""
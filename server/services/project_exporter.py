@@ -6,13 +6,18 @@ vite.config.ts, tsconfig.json, index.html) added if missing.
 
 from __future__ import annotations
 
-import io
-import json
 import logging
 import zipfile
+from typing import Iterator
+
+import orjson
 
 log = logging.getLogger("aus.exporter")
 
+# Deflate level for exported archives: level 1 is several times faster than
+# the default 6 and only a few percent larger on source text
+EXPORT_COMPRESSLEVEL = 1
+
 
 # Scaffolding templates for missing files
 PACKAGE_JSON_TEMPLATE = {
@@ -99,70 +104,115 @@ export default {
 """
 
 
-def export_to_zip(project: dict) -> bytes:
-    """Convert an AusProject dict to ZIP bytes.
+# Static scaffolding encoded once; index.html is split around its {name} slot
+_VITE_CONFIG_B = VITE_CONFIG.encode()
+_TSCONFIG_B = TSCONFIG.encode()
+_POSTCSS_CONFIG_B = POSTCSS_CONFIG.encode()
+_TAILWIND_CONFIG_B = TAILWIND_CONFIG.encode()
+_INDEX_HTML_PRE, _, _INDEX_HTML_POST = (part.encode() for part in INDEX_HTML.partition("{name}"))
+
 
-    Returns bytes suitable for StreamingResponse.
+class _ChunkSink:
+    """Write-only file object that collects zipfile output between yields.
+
+    It has no tell()/seek(), so zipfile writes entries in streaming mode
+    (sizes in data descriptors) and never needs to rewind.
     """
-    buf = io.BytesIO()
-    name = project.get("name", "project")
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.buf += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        chunk = bytes(self.buf)
+        self.buf.clear()
+        return chunk
+
+
+def _entries(project: dict) -> Iterator[tuple[str, str | bytes]]:
+    """Yield (path, content) for every file in the exported project."""
     files = project.get("files", [])
     frontend_deps = project.get("frontend_deps", {})
     file_paths = {f["path"] for f in files}
 
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
-        # Write all project files
-        for f in files:
-            zf.writestr(f"{name}/{f['path']}", f["content"])
-
-        # Add scaffolding if missing
-        if "package.json" not in file_paths:
-            pkg = json.loads(json.dumps(PACKAGE_JSON_TEMPLATE))
-            pkg["name"] = name
-            # Merge frontend deps
-            if frontend_deps:
-                pkg["dependencies"].update(frontend_deps)
-            zf.writestr(
-                f"{name}/package.json",
-                json.dumps(pkg, indent=2),
-            )
-
-        if "vite.config.ts" not in file_paths:
-            zf.writestr(f"{name}/vite.config.ts", VITE_CONFIG)
-
-        if "tsconfig.json" not in file_paths:
-            zf.writestr(f"{name}/tsconfig.json", TSCONFIG)
-
-        if "index.html" not in file_paths:
-            zf.writestr(
-                f"{name}/index.html",
-                INDEX_HTML.replace("{name}", name),
-            )
-
-        # Add Tailwind config if tailwindcss is a dep
-        has_tailwind = "tailwindcss" in frontend_deps or any(
-            "tailwind" in f.get("content", "")
-            for f in files
-            if f["path"].endswith(".css")
-        )
-        if has_tailwind:
-            if "tailwind.config.ts" not in file_paths and "tailwind.config.js" not in file_paths:
-                zf.writestr(f"{name}/tailwind.config.ts", TAILWIND_CONFIG)
-            if "postcss.config.cjs" not in file_paths and "postcss.config.js" not in file_paths:
-                zf.writestr(f"{name}/postcss.config.js", POSTCSS_CONFIG)
-
-        # Write .aus-project.json metadata
-        meta = {
-            "id": project.get("id", ""),
-            "name": name,
-            "stack": project.get("stack", "react-only"),
-            "version": project.get("version", 1),
-            "file_count": len(files),
+    # Write all project files
+    for f in files:
+        yield f["path"], f["content"]
+
+    # Add scaffolding if missing
+    if "package.json" not in file_paths:
+        # Copy only the nested dicts that get mutated; the rest is shared
+        pkg = {
+            **PACKAGE_JSON_TEMPLATE,
+            "name": project.get("name", "project"),
+            "dependencies": {**PACKAGE_JSON_TEMPLATE["dependencies"], **frontend_deps},
         }
-        zf.writestr(
-            f"{name}/.aus-project.json",
-            json.dumps(meta, indent=2),
-        )
+        yield "package.json", orjson.dumps(pkg, option=orjson.OPT_INDENT_2)
+
+    if "vite.config.ts" not in file_paths:
+        yield "vite.config.ts", _VITE_CONFIG_B
+
+    if "tsconfig.json" not in file_paths:
+        yield "tsconfig.json", _TSCONFIG_B
+
+    if "index.html" not in file_paths:
+        name = project.get("name", "project")
+        yield "index.html", _INDEX_HTML_PRE + name.encode() + _INDEX_HTML_POST
+
+    # Add Tailwind config if tailwindcss is a dep
+    has_tailwind = "tailwindcss" in frontend_deps or any(
+        "tailwind" in f.get("content", "")
+        for f in files
+        if f["path"].endswith(".css")
+    )
+    if has_tailwind:
+        if "tailwind.config.ts" not in file_paths and "tailwind.config.js" not in file_paths:
+            yield "tailwind.config.ts", _TAILWIND_CONFIG_B
+        if "postcss.config.cjs" not in file_paths and "postcss.config.js" not in file_paths:
+            yield "postcss.config.js", _POSTCSS_CONFIG_B
+
+    # Write .aus-project.json metadata
+    meta = {
+        "id": project.get("id", ""),
+        "name": project.get("name", "project"),
+        "stack": project.get("stack", "react-only"),
+        "version": project.get("version", 1),
+        "file_count": len(files),
+    }
+    yield ".aus-project.json", orjson.dumps(meta, option=orjson.OPT_INDENT_2)
+
+
+def export_to_zip_stream(project: dict) -> Iterator[bytes]:
+    """Convert an AusProject dict to ZIP bytes, yielded entry by entry.
+
+    Only the compressed output of one file is held at a time, so it suits
+    StreamingResponse for large projects.
+    """
+    name = project.get("name", "project")
+    sink = _ChunkSink()
+    total = 0
+    with zipfile.ZipFile(
+        sink, "w", zipfile.ZIP_DEFLATED, compresslevel=EXPORT_COMPRESSLEVEL
+    ) as zf:
+        for path, content in _entries(project):
+            zf.writestr(f"{name}/{path}", content)
+            if sink.buf:
+                total += len(sink.buf)
+                yield sink.take()
+    # Closing writes the central directory
+    total += len(sink.buf)
+    yield sink.take()
+    log.info(
+        "Exported %d files to ZIP (%d bytes)", len(project.get("files", [])), total
+    )
 
-    log.info("Exported %d files to ZIP (%d bytes)", len(files), buf.tell())
-    return buf.getvalue()
+
+def export_to_zip(project: dict) -> bytes:
+    """Convert an AusProject dict to ZIP bytes."""
+    return b"".join(export_to_zip_stream(project))
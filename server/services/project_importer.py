@@ -6,15 +6,19 @@ and returns a dict matching the AusProject schema.
 
 from __future__ import annotations
 
+import functools
 import io
-import json
 import logging
 import os
 import uuid
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 log = logging.getLogger("aus.importer")
 
 # Directories to skip during import
@@ -34,6 +38,9 @@ TEXT_EXTENSIONS = {
 # Max file size to import (500KB)
 MAX_FILE_SIZE = 500_000
 
+# Threads reading files during a folder import (the work is syscall-bound)
+READ_WORKERS = 16
+
 # Role detection by file path patterns
 ROLE_MAP: list[tuple[str, str]] = [
     ("App.tsx", "ENTRY"),
@@ -64,6 +71,18 @@ ROLE_MAP: list[tuple[str, str]] = [
 ]
 
 
+# Language by file extension
+LANGUAGE_MAP: dict[str, str] = {
+    ".ts": "typescript", ".tsx": "typescript",
+    ".js": "javascript", ".jsx": "javascript",
+    ".py": "python", ".json": "json", ".html": "html",
+    ".css": "css", ".md": "markdown", ".sql": "sql",
+    ".yaml": "yaml", ".yml": "yaml", ".toml": "toml",
+    ".sh": "bash", ".svg": "xml",
+}
+
+
+@functools.lru_cache(maxsize=4096)
 def _detect_role(path: str) -> str:
     """Detect file role from path patterns."""
     lower = path.lower()
@@ -75,16 +94,7 @@ def _detect_role(path: str) -> str:
 
 def _detect_language(path: str) -> str:
     """Detect language from file extension."""
-    ext = Path(path).suffix.lower()
-    lang_map = {
-        ".ts": "typescript", ".tsx": "typescript",
-        ".js": "javascript", ".jsx": "javascript",
-        ".py": "python", ".json": "json", ".html": "html",
-        ".css": "css", ".md": "markdown", ".sql": "sql",
-        ".yaml": "yaml", ".yml": "yaml", ".toml": "toml",
-        ".sh": "bash", ".svg": "xml",
-    }
-    return lang_map.get(ext, "text")
+    return LANGUAGE_MAP.get(os.path.splitext(path)[1].lower(), "text")
 
 
 def _should_skip_dir(name: str) -> bool:
@@ -107,24 +117,20 @@ def _should_include_file(path: str, size: int) -> bool:
 def _parse_package_json(content: str) -> tuple[dict[str, str], dict[str, str]]:
     """Parse package.json and return (dependencies, devDependencies)."""
     try:
-        pkg = json.loads(content)
+        pkg = orjson.loads(content)
         deps = pkg.get("dependencies", {})
         dev_deps = pkg.get("devDependencies", {})
         return deps, dev_deps
-    except (json.JSONDecodeError, TypeError):
+    except (orjson.JSONDecodeError, TypeError):
         return {}, {}
 
 
 def _detect_stack(files: list[dict], deps: dict[str, str]) -> str:
     """Detect project stack from files and dependencies."""
     has_react = "react" in deps
+    # Any .py file already implies a backend, so contents never need scanning
     has_python = any(f["path"].endswith(".py") for f in files)
-    has_fastapi = any(
-        "fastapi" in f.get("content", "")
-        for f in files
-        if f["path"].endswith(".py")
-    )
-    if has_react and (has_python or has_fastapi):
+    if has_react and has_python:
         return "react-fastapi"
     if has_react:
         return "react-only"
@@ -133,6 +139,17 @@ def _detect_stack(files: list[dict], deps: dict[str, str]) -> str:
     return "react-only"
 
 
+def _read_candidate(candidate: tuple[Path, str]) -> str | None:
+    """Read one walked file, or None if it is filtered out or unreadable."""
+    filepath, rel_path = candidate
+    try:
+        if not _should_include_file(rel_path, filepath.stat().st_size):
+            return None
+        return filepath.read_text(encoding="utf-8")
+    except (UnicodeDecodeError, PermissionError, OSError):
+        return None
+
+
 def import_from_folder(folder_path: str) -> dict[str, Any]:
     """Import a project from a folder on disk.
 
@@ -142,39 +159,36 @@ def import_from_folder(folder_path: str) -> dict[str, Any]:
     if not root.is_dir():
         raise FileNotFoundError(f"Directory not found: {folder_path}")
 
-    files: list[dict[str, Any]] = []
-    pkg_content = ""
-    order = 0
-
+    # Walk first (cheap, ordered), then stat and read in parallel
+    candidates: list[tuple[Path, str]] = []
     for dirpath, dirnames, filenames in os.walk(root):
         # Filter out skip directories in-place
         dirnames[:] = [d for d in dirnames if not _should_skip_dir(d)]
-
-        for filename in sorted(filenames):
+        for filename in filenames:
             filepath = Path(dirpath) / filename
-            rel_path = str(filepath.relative_to(root))
-            stat = filepath.stat()
+            candidates.append((filepath, str(filepath.relative_to(root))))
+    # One sort over the whole tree instead of one per directory; this also
+    # makes order independent of how the OS lists subdirectories
+    candidates.sort(key=itemgetter(1))
 
-            if not _should_include_file(rel_path, stat.st_size):
-                continue
-
-            try:
-                content = filepath.read_text(encoding="utf-8")
-            except (UnicodeDecodeError, PermissionError, OSError):
-                continue
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        contents = list(pool.map(_read_candidate, candidates))
 
-            if filename == "package.json" and dirpath == str(root):
-                pkg_content = content
-
-            files.append({
-                "path": rel_path,
-                "content": content,
-                "role": _detect_role(rel_path),
-                "language": _detect_language(rel_path),
-                "size": len(content),
-                "order": order,
-            })
-            order += 1
+    files: list[dict[str, Any]] = []
+    pkg_content = ""
+    for (_, rel_path), content in zip(candidates, contents):
+        if content is None:
+            continue
+        if rel_path == "package.json":
+            pkg_content = content
+        files.append({
+            "path": rel_path,
+            "content": content,
+            "role": _detect_role(rel_path),
+            "language": _detect_language(rel_path),
+            "size": len(content),
+            "order": len(files),
+        })
 
     deps, _ = _parse_package_json(pkg_content) if pkg_content else ({}, {})
     stack = _detect_stack(files, deps)
@@ -183,8 +197,8 @@ def import_from_folder(folder_path: str) -> dict[str, Any]:
     # Try to get name from package.json
     if pkg_content:
         try:
-            name = json.loads(pkg_content).get("name", root.name)
-        except (json.JSONDecodeError, TypeError):
+            name = orjson.loads(pkg_content).get("name", root.name)
+        except (orjson.JSONDecodeError, TypeError):
             pass
 
     log.info("Imported %d files from %s (stack=%s)", len(files), folder_path, stack)
@@ -203,8 +217,8 @@ def import_from_folder(folder_path: str) -> dict[str, Any]:
     }
 
 
-def import_from_zip(zip_bytes: bytes) -> dict[str, Any]:
-    """Import a project from ZIP file bytes.
+def import_from_zip(zip_source: bytes | str | os.PathLike) -> dict[str, Any]:
+    """Import a project from ZIP file bytes or a path to a ZIP on disk.
 
     Returns a dict matching the AusProject schema.
     """
@@ -212,18 +226,19 @@ def import_from_zip(zip_bytes: bytes) -> dict[str, Any]:
     pkg_content = ""
     order = 0
 
-    with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as zf:
+    if isinstance(zip_source, bytes):
+        zip_source = io.BytesIO(zip_source)
+    with zipfile.ZipFile(zip_source, "r") as zf:
         # Detect common root directory (many ZIPs have a single root folder)
-        names = zf.namelist()
+        infos = zf.infolist()
         common_prefix = ""
-        if names:
-            parts = names[0].split("/")
-            if len(parts) > 1:
-                candidate = parts[0] + "/"
-                if all(n.startswith(candidate) or n == candidate.rstrip("/") for n in names):
-                    common_prefix = candidate
-
-        for info in zf.infolist():
+        if infos and "/" in infos[0].filename:
+            top = infos[0].filename.partition("/")[0]
+            candidate = top + "/"
+            if all(i.filename.startswith(candidate) or i.filename == top for i in infos):
+                common_prefix = candidate
+
+        for info in infos:
             if info.is_dir():
                 continue
 
@@ -242,8 +257,9 @@ def import_from_zip(zip_bytes: bytes) -> dict[str, Any]:
                 continue
 
             try:
-                content = zf.read(info.filename).decode("utf-8")
-            except (UnicodeDecodeError, KeyError):
+                # Reading by ZipInfo skips the by-name lookup
+                content = zf.read(info).decode("utf-8")
+            except UnicodeDecodeError:
                 continue
 
             if Path(path).name == "package.json" and "/" not in path:
@@ -265,8 +281,8 @@ def import_from_zip(zip_bytes: bytes) -> dict[str, Any]:
     name = "imported-project"
     if pkg_content:
         try:
-            name = json.loads(pkg_content).get("name", name)
-        except (json.JSONDecodeError, TypeError):
+            name = orjson.loads(pkg_content).get("name", name)
+        except (orjson.JSONDecodeError, TypeError):
             pass
 
     log.info("Imported %d files from ZIP (stack=%s)", len(files), stack)
@@ -7,12 +7,19 @@ automatically next to the server package on first import.
 
 from __future__ import annotations
 
-import json
 import sqlite3
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
 
+import orjson
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 DB_PATH = Path(__file__).parent.parent / "studio_projects.db"
 
 
@@ -20,14 +27,51 @@ DB_PATH = Path(__file__).parent.parent / "studio_projects.db"
 # Connection helper
 # ---------------------------------------------------------------------------
 
+# One long-lived connection per thread (FastAPI runs sync endpoints on a
+# reused worker pool), so connect + PRAGMAs happen once, not per call.
+# Writes go through `with conn:` so a failure never leaves a transaction open.
+_local = threading.local()
+
+
 def _get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(DB_PATH))
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        _local.conn = conn
     return conn
 
 
+# ---------------------------------------------------------------------------
+# Files column encoding
+# ---------------------------------------------------------------------------
+
+# With zstandard installed, project and snapshot files are stored as a zstd
+# frame (BLOB); otherwise as JSON text. Reads accept both, so existing rows
+# and databases written without zstandard keep working.
+FILES_ZSTD_LEVEL = 3
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _pack_files(files: dict | list) -> bytes | str:
+    raw = orjson.dumps(files)
+    if zstandard is None:
+        return raw.decode()
+    return zstandard.compress(raw, FILES_ZSTD_LEVEL)
+
+
+def _unpack_files(value: bytes | str) -> dict | list:
+    if isinstance(value, bytes) and value.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("Project files are zstd-compressed; pip install zstandard")
+        value = zstandard.decompress(value)
+    return orjson.loads(value)
+
+
 # ---------------------------------------------------------------------------
 # Schema bootstrap
 # ---------------------------------------------------------------------------
@@ -58,8 +102,11 @@ def init_db():
             timestamp TEXT NOT NULL,
             FOREIGN KEY (project_id) REFERENCES studio_projects(id) ON DELETE CASCADE
         );
+        CREATE INDEX IF NOT EXISTS idx_versions_project_version
+            ON studio_versions(project_id, version_number DESC);
+        CREATE INDEX IF NOT EXISTS idx_projects_updated
+            ON studio_projects(updated_at DESC);
     """)
-    conn.close()
 
 
 # ---------------------------------------------------------------------------
@@ -77,25 +124,23 @@ def create_project(
     """Create a new project and return it."""
     project_id = uuid.uuid4().hex[:12]
     now = datetime.utcnow().isoformat()
-    conn = _get_conn()
-    conn.execute(
-        "INSERT INTO studio_projects "
-        "(id, name, description, stack, files, frontend_deps, backend_deps, created_at, updated_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (
-            project_id,
-            name,
-            description,
-            stack,
-            json.dumps(files),
-            json.dumps(frontend_deps),
-            json.dumps(backend_deps),
-            now,
-            now,
-        ),
-    )
-    conn.commit()
-    conn.close()
+    with _get_conn() as conn:
+        conn.execute(
+            "INSERT INTO studio_projects "
+            "(id, name, description, stack, files, frontend_deps, backend_deps, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                project_id,
+                name,
+                description,
+                stack,
+                _pack_files(files),
+                orjson.dumps(frontend_deps).decode(),
+                orjson.dumps(backend_deps).decode(),
+                now,
+                now,
+            ),
+        )
     return get_project(project_id)
 
 
@@ -107,7 +152,6 @@ def list_projects() -> list[dict]:
         "current_version, created_at, updated_at "
         "FROM studio_projects ORDER BY updated_at DESC"
     ).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
@@ -117,13 +161,12 @@ def get_project(project_id: str) -> dict | None:
     row = conn.execute(
         "SELECT * FROM studio_projects WHERE id = ?", (project_id,)
     ).fetchone()
-    conn.close()
     if not row:
         return None
     d = dict(row)
-    d["files"] = json.loads(d["files"])
-    d["frontend_deps"] = json.loads(d["frontend_deps"])
-    d["backend_deps"] = json.loads(d["backend_deps"])
+    d["files"] = _unpack_files(d["files"])
+    d["frontend_deps"] = orjson.loads(d["frontend_deps"])
+    d["backend_deps"] = orjson.loads(d["backend_deps"])
     return d
 
 
@@ -137,35 +180,31 @@ def update_project(project_id: str, data: dict) -> bool:
         "name", "description", "stack", "complexity",
         "files", "frontend_deps", "backend_deps",
     }
-    updates: dict[str, str] = {}
+    updates: dict[str, str | bytes] = {}
     for k, v in data.items():
-        if k in allowed:
-            updates[k] = json.dumps(v) if isinstance(v, (dict, list)) else v
+        if k == "files" and isinstance(v, (dict, list)):
+            updates[k] = _pack_files(v)
+        elif k in allowed:
+            updates[k] = orjson.dumps(v).decode() if isinstance(v, (dict, list)) else v
     if not updates:
         return False
     updates["updated_at"] = datetime.utcnow().isoformat()
     set_clause = ", ".join(f"{k} = ?" for k in updates)
     values = list(updates.values()) + [project_id]
-    conn = _get_conn()
-    cursor = conn.execute(
-        f"UPDATE studio_projects SET {set_clause} WHERE id = ?", values
-    )
-    conn.commit()
-    changed = cursor.rowcount > 0
-    conn.close()
-    return changed
+    with _get_conn() as conn:
+        cursor = conn.execute(
+            f"UPDATE studio_projects SET {set_clause} WHERE id = ?", values
+        )
+    return cursor.rowcount > 0
 
 
 def delete_project(project_id: str) -> bool:
     """Delete a project and all its versions (cascade)."""
-    conn = _get_conn()
-    cursor = conn.execute(
-        "DELETE FROM studio_projects WHERE id = ?", (project_id,)
-    )
-    conn.commit()
-    changed = cursor.rowcount > 0
-    conn.close()
-    return changed
+    with _get_conn() as conn:
+        cursor = conn.execute(
+            "DELETE FROM studio_projects WHERE id = ?", (project_id,)
+        )
+    return cursor.rowcount > 0
 
 
 # ---------------------------------------------------------------------------
@@ -174,32 +213,28 @@ def delete_project(project_id: str) -> bool:
 
 def save_version(project_id: str, message: str = "") -> dict | None:
     """Snapshot the current files as a new version."""
-    project = get_project(project_id)
-    if not project:
-        return None
-    version_num = project["current_version"] + 1
-    version_id = uuid.uuid4().hex[:12]
-    now = datetime.utcnow().isoformat()
-    conn = _get_conn()
-    conn.execute(
-        "INSERT INTO studio_versions "
-        "(id, project_id, version_number, files, message, timestamp) "
-        "VALUES (?, ?, ?, ?, ?, ?)",
-        (
-            version_id,
-            project_id,
-            version_num,
-            json.dumps(project["files"]),
-            message,
-            now,
-        ),
-    )
-    conn.execute(
-        "UPDATE studio_projects SET current_version = ?, updated_at = ? WHERE id = ?",
-        (version_num, now, project_id),
-    )
-    conn.commit()
-    conn.close()
+    # The stored files JSON is copied as-is; no parse/re-encode round trip.
+    # Insert and version bump commit together.
+    with _get_conn() as conn:
+        row = conn.execute(
+            "SELECT current_version, files FROM studio_projects WHERE id = ?",
+            (project_id,),
+        ).fetchone()
+        if not row:
+            return None
+        version_num = row["current_version"] + 1
+        version_id = uuid.uuid4().hex[:12]
+        now = datetime.utcnow().isoformat()
+        conn.execute(
+            "INSERT INTO studio_versions "
+            "(id, project_id, version_number, files, message, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (version_id, project_id, version_num, row["files"], message, now),
+        )
+        conn.execute(
+            "UPDATE studio_projects SET current_version = ?, updated_at = ? WHERE id = ?",
+            (version_num, now, project_id),
+        )
     return {
         "id": version_id,
         "project_id": project_id,
@@ -218,7 +253,6 @@ def list_versions(project_id: str) -> list[dict]:
         "ORDER BY version_number DESC",
         (project_id,),
     ).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
@@ -235,21 +269,17 @@ def restore_version(project_id: str, version_number: int) -> dict | None:
         (project_id, version_number),
     ).fetchone()
     if not row:
-        conn.close()
         return None
-    conn.close()
 
     # Auto-save current state before restore
     save_version(project_id, f"Auto-save before restore to v{version_number}")
 
     now = datetime.utcnow().isoformat()
-    conn = _get_conn()
-    conn.execute(
-        "UPDATE studio_projects SET files = ?, updated_at = ? WHERE id = ?",
-        (row["files"], now, project_id),
-    )
-    conn.commit()
-    conn.close()
+    with _get_conn() as conn:
+        conn.execute(
+            "UPDATE studio_projects SET files = ?, updated_at = ? WHERE id = ?",
+            (row["files"], now, project_id),
+        )
     return get_project(project_id)
 
 
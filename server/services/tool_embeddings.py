@@ -1,66 +1,140 @@
 """Semantic tool search using Gemini embeddings.
 
-Pre-computed embeddings for tools (768-dim).
+Pre-computed embeddings for tools (768-dim, stored int8-quantized).
 Query embedding computed on-the-fly via Gemini Embedding API.
-Cosine similarity ranking — no numpy needed.
+Rows are normalized once at load, so cosine ranking is a dot product per
+tool. With numpy installed the rows form one float32 matrix and a query is
+a single matrix-vector product; without it (e.g. the mobile deployment)
+ranking falls back to pure Python.
 """
 
 from __future__ import annotations
 
-import json
+import base64
+import heapq
 import math
 import os
 import logging
+from array import array
+from operator import itemgetter, mul
 from typing import Any
 
+import orjson
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from google.genai import types as genai_types
+except ImportError:
+    genai_types = None
+
+from aus.generators.llm import gemini_client
+
 log = logging.getLogger("aus.tool_embeddings")
 
 EMBEDDINGS_PATH = os.path.join(os.path.dirname(__file__), "..", "tool_embeddings.json")
 EMBEDDING_MODEL = "gemini-embedding-001"
 EMBEDDING_DIM = 768
 
-# Lazy-loaded cache
-_tool_embeddings: dict[str, list[float]] | None = None
+# Lazy-loaded cache: row i is the unit embedding of _tool_ids[i]. A float32
+# ndarray when numpy is available, else a list of float lists.
+_tool_ids: list[str] | None = None
+_emb_matrix: Any = None
 _tool_metadata: dict[str, dict[str, Any]] | None = None
+_domain_masks: dict[str, Any] = {}
+
+
+def quantize(vec: list[float]) -> dict[str, Any]:
+    """Pack a vector as int8 with one scale: {"scale", "q": base64 bytes}.
+
+    ~8x smaller than JSON floats; cosine ranking is unaffected in practice.
+    """
+    scale = max((abs(v) for v in vec), default=0.0) / 127.0 or 1.0
+    q = array("b", (round(v / scale) for v in vec))
+    return {"scale": scale, "q": base64.b64encode(q.tobytes()).decode("ascii")}
+
+
+def _embedding_of(item: dict[str, Any]) -> list[float]:
+    # Older indexes store the float list directly
+    if "embedding" in item:
+        return item["embedding"]
+    scale = item["scale"]
+    return [v * scale for v in array("b", base64.b64decode(item["q"]))]
+
+
+def _normalize(vec: list[float]) -> list[float]:
+    """Scale to unit length, so cosine similarity is a plain dot product."""
+    norm = math.sqrt(sum(map(mul, vec, vec)))
+    return [x / norm for x in vec] if norm else list(vec)
 
 
 def _load_embeddings() -> None:
     """Load pre-computed embeddings on first use."""
-    global _tool_embeddings, _tool_metadata
-    if _tool_embeddings is not None:
+    global _tool_ids, _emb_matrix, _tool_metadata
+    if _tool_ids is not None:
         return
     try:
-        with open(EMBEDDINGS_PATH) as f:
-            data = json.load(f)
-        _tool_embeddings = {item["id"]: item["embedding"] for item in data}
-        _tool_metadata = {item["id"]: item for item in data}
-        log.info("Loaded %d tool embeddings (%d-dim)", len(_tool_embeddings), EMBEDDING_DIM)
+        with open(EMBEDDINGS_PATH, "rb") as f:
+            data = orjson.loads(f.read())
     except FileNotFoundError:
         log.warning("tool_embeddings.json not found — semantic search unavailable")
-        _tool_embeddings = {}
-        _tool_metadata = {}
+        data = []
+    rows = [_normalize(_embedding_of(item)) for item in data]
+    if np is not None:
+        _emb_matrix = np.asarray(rows, dtype=np.float32).reshape(len(rows), EMBEDDING_DIM)
+    else:
+        _emb_matrix = rows
+    _tool_metadata = {item["id"]: item for item in data}
+    _tool_ids = [item["id"] for item in data]
+    if data:
+        log.info("Loaded %d tool embeddings (%d-dim)", len(_tool_ids), EMBEDDING_DIM)
+
+
+def _domain_mask(domain: str) -> Any:
+    """Row mask of tools tagged with `domain`, built once per domain."""
+    mask = _domain_masks.get(domain)
+    if mask is None:
+        mask = [domain in _tool_metadata[t].get("domains", []) for t in _tool_ids]
+        if np is not None:
+            mask = np.asarray(mask, dtype=bool)
+        _domain_masks[domain] = mask
+    return mask
+
+
+def _top_numpy(q: list[float], top_k: int, domain: str) -> list[tuple[int, float]]:
+    scores = _emb_matrix @ np.asarray(q, dtype=np.float32)
+    if domain:
+        # Excluded rows sort below every real cosine score
+        scores[~_domain_mask(domain)] = -np.inf
+    k = min(top_k, int(np.count_nonzero(scores > -np.inf)))
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [(int(i), float(scores[i])) for i in top]
 
 
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
-    """Pure-Python cosine similarity. No numpy needed."""
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+def _top_python(q: list[float], top_k: int, domain: str) -> list[tuple[int, float]]:
+    mask = _domain_mask(domain) if domain else None
+    scored = (
+        (i, sum(map(mul, q, row)))
+        for i, row in enumerate(_emb_matrix)
+        if mask is None or mask[i]
+    )
+    return heapq.nlargest(top_k, scored, key=itemgetter(1))
 
 
 async def embed_query(query: str, api_key: str) -> list[float]:
     """Embed a search query using Gemini Embedding API."""
-    from google import genai
-    from google.genai import types
-
-    client = genai.Client(api_key=api_key)
-    result = await client.aio.models.embed_content(
+    if genai_types is None:
+        raise RuntimeError("google-genai is not installed (pip install google-genai)")
+    result = await gemini_client(api_key).aio.models.embed_content(
         model=EMBEDDING_MODEL,
         contents=query,
-        config=types.EmbedContentConfig(
+        config=genai_types.EmbedContentConfig(
             task_type="RETRIEVAL_QUERY",
             output_dimensionality=EMBEDDING_DIM,
         ),
@@ -73,25 +147,16 @@ async def search_tools_semantic(
 ) -> list[dict[str, Any]]:
     """Semantic search: embed query, rank tools by cosine similarity."""
     _load_embeddings()
-    if not _tool_embeddings:
+    if not _tool_ids:
         return []
 
-    query_embedding = await embed_query(query, api_key)
-
-    scored = []
-    for tool_id, tool_emb in _tool_embeddings.items():
-        if domain and _tool_metadata:
-            meta = _tool_metadata.get(tool_id, {})
-            if domain not in meta.get("domains", []):
-                continue
-        score = _cosine_similarity(query_embedding, tool_emb)
-        scored.append((tool_id, score))
-
-    scored.sort(key=lambda x: x[1], reverse=True)
+    q = _normalize(await embed_query(query, api_key))
+    top = (_top_numpy if np is not None else _top_python)(q, top_k, domain)
 
     results = []
-    for tool_id, score in scored[:top_k]:
-        meta = (_tool_metadata or {}).get(tool_id, {})
+    for i, score in top:
+        tool_id = _tool_ids[i]
+        meta = _tool_metadata[tool_id]
         results.append({
             "id": tool_id,
             "name": meta.get("name", tool_id),
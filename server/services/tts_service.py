@@ -11,6 +11,7 @@ import io
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 
 import numpy as np
@@ -65,6 +66,7 @@ CACHED_LINES: list[tuple[str, str, str]] = [
     ("boot_loading_voice", VOX_VOICE, "Loading voice library."),
     ("boot_ready", VOX_VOICE, "Ready."),
 ]
+_CACHED_BY_NAME = {filename: (voice, text) for filename, voice, text in CACHED_LINES}
 
 
 class TTSService:
@@ -73,6 +75,8 @@ class TTSService:
         self.voices: dict[str, np.ndarray] = {}
         self.tokenizer: Tokenizer | None = None
         self._loaded = False
+        # Precache runs in the background while requests may ask for a line
+        self._cache_lock = threading.Lock()
 
     def load(self) -> None:
         if self._loaded:
@@ -122,18 +126,29 @@ class TTSService:
         buf.seek(0)
         return buf.read()
 
-    def precache(self) -> int:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        count = 0
-        for filename, voice, text in CACHED_LINES:
-            wav_path = CACHE_DIR / f"{filename}.wav"
+    def _cache_line(self, filename: str, voice: str, text: str) -> Path:
+        wav_path = CACHE_DIR / f"{filename}.wav"
+        with self._cache_lock:
             if wav_path.exists():
                 log.debug("Cache hit: %s", filename)
-                count += 1
-                continue
+                return wav_path
             log.info("Generating %s (%s): %s", filename, voice, text[:40])
             samples, sr = self.speak(text, voice)
-            sf.write(str(wav_path), samples, sr)
+            # Write aside and rename into place: get_cached_path doesn't take
+            # the lock, so it must never see a half-written file
+            tmp_path = wav_path.with_name(f".{wav_path.name}.tmp")
+            try:
+                sf.write(str(tmp_path), samples, sr, format="WAV")
+                os.replace(tmp_path, wav_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        return wav_path
+
+    def precache(self) -> int:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for filename, voice, text in CACHED_LINES:
+            self._cache_line(filename, voice, text)
             count += 1
         log.info("TTS cache ready: %d files in %s", count, CACHE_DIR)
         return count
@@ -142,6 +157,14 @@ class TTSService:
         path = CACHE_DIR / f"{filename}.wav"
         return path if path.exists() else None
 
+    def ensure_cached(self, filename: str) -> Path | None:
+        """Cached path for a known line, generating it now if precache hasn't yet."""
+        path = self.get_cached_path(filename)
+        if path is not None or filename not in _CACHED_BY_NAME:
+            return path
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        return self._cache_line(filename, *_CACHED_BY_NAME[filename])
+
     # ------------------------------------------------------------------
     # Async wrappers — non-blocking for FastAPI event loop
     # ------------------------------------------------------------------
@@ -162,5 +185,11 @@ class TTSService:
     async def aprecache(self) -> int:
         return await asyncio.to_thread(self.precache)
 
+    async def aensure_cached(self, filename: str) -> Path | None:
+        path = self.get_cached_path(filename)
+        if path is not None:
+            return path
+        return await asyncio.to_thread(self.ensure_cached, filename)
+
 
 tts = TTSService()
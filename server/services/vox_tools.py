@@ -12,6 +12,9 @@ import logging
 import os
 from typing import Any
 
+from aus.generators.llm import gemini_client
+from server.services.tool_embeddings import search_tools_semantic
+
 log = logging.getLogger("aus.vox.tools")
 
 # Tool catalog is loaded from a JSON snapshot (generated from frontend registry)
@@ -67,9 +70,7 @@ class VoxToolDispatcher:
             return {"recommendations": [], "error": "No API key"}
 
         try:
-            from google import genai
-
-            client = genai.Client(api_key=self._gemini_key)
+            client = gemini_client(self._gemini_key)
 
             _ensure_catalog()
             tool_names = [t["id"] for t in TOOL_CATALOG[:50]]
@@ -183,7 +184,6 @@ class VoxToolDispatcher:
         # Try semantic search first
         if self._gemini_key and query:
             try:
-                from server.services.tool_embeddings import search_tools_semantic
                 results = await search_tools_semantic(
                     query, self._gemini_key, top_k=10, domain=domain
                 )